@@ -0,0 +1,269 @@
+import ipaddress
+import math
+import os
+import re
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from .ingest import UPLOAD_MAX_BYTES
+
+# Per-client rates are "<requests>/<seconds>" (a bucket of <requests> tokens
+# refilled over <seconds>); concurrency limits are shared by all clients.
+# "0" disables either.
+RATE_LIMIT_VOLUNTEERS = os.getenv("RATE_LIMIT_VOLUNTEERS", "5/600")
+RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/300")
+RATE_LIMIT_UPLOADS = os.getenv("RATE_LIMIT_UPLOADS", "120/60")
+CONCURRENCY_LIMIT_LOGIN = int(os.getenv("CONCURRENCY_LIMIT_LOGIN", "8"))
+CONCURRENCY_LIMIT_UPLOADS = int(os.getenv("CONCURRENCY_LIMIT_UPLOADS", "8"))
+# Retry-After sent when a concurrency limit sheds a request
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+# Number of reverse proxies in front of the app that append to X-Forwarded-For.
+# 0 uses the socket peer address (spoofable headers are ignored).
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+# Buckets tracked before idle (full) ones are dropped
+RATE_LIMIT_MAX_CLIENTS = 10000
+# Request bodies on upload routes are capped before they are read: one file
+# (UPLOAD_MAX_MB) plus its form fields, or a batch of files up to this size
+UPLOAD_MAX_REQUEST_BYTES = int(float(os.getenv("UPLOAD_MAX_REQUEST_MB", "200")) * 1024 * 1024)
+FORM_FIELDS_MAX_BYTES = 1024 * 1024
+BATCH_UPLOAD_PATH = re.compile(r"^/api/folders/[^/]+/images:batch$")
+
+
+def upload_body_limit(path: str) -> int:
+    if BATCH_UPLOAD_PATH.match(path):
+        return UPLOAD_MAX_REQUEST_BYTES
+    return UPLOAD_MAX_BYTES + FORM_FIELDS_MAX_BYTES
+
+
+def parse_rate(spec: str) -> Optional[Tuple[int, float]]:
+    count, _, seconds = spec.strip().partition("/")
+    if not count or count == "0":
+        return None
+    return int(count), float(seconds or 1)
+
+
+class Rule:
+    """Requests matched by method/path (and optionally multipart bodies)."""
+
+    def __init__(self, name: str, methods, path: str, rate: Optional[str] = None,
+                 concurrency: int = 0, multipart_only: bool = False,
+                 max_body: Union[int, Callable[[str], int], None] = None):
+        self.name = name
+        self.methods = set(methods)
+        self.path = re.compile(path)
+        self.rate = parse_rate(rate) if rate else None
+        self.concurrency = concurrency
+        self.multipart_only = multipart_only
+        # Bytes of request body allowed, or a function of the path giving them
+        self.max_body = max_body
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self.too_large = 0
+
+    def body_limit(self, scope) -> Optional[int]:
+        return self.max_body(scope["path"]) if callable(self.max_body) else self.max_body
+
+    def matches(self, scope) -> bool:
+        if scope["method"] not in self.methods or not self.path.match(scope["path"]):
+            return False
+        if self.multipart_only:
+            return Headers(scope=scope).get("content-type", "").startswith("multipart/form-data")
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "rate": f"{self.rate[0]}/{self.rate[1]:g}s" if self.rate else None,
+            "concurrency": self.concurrency or None,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "shed": self.shed,
+            "too_large": self.too_large,
+        }
+
+
+DEFAULT_RULES = (
+    Rule("volunteers", ["POST"], r"^/api/volunteers$", rate=RATE_LIMIT_VOLUNTEERS),
+    Rule("login", ["POST"], r"^/api/auth/login$", rate=RATE_LIMIT_LOGIN, concurrency=CONCURRENCY_LIMIT_LOGIN),
+    # Every route that takes files (image uploads and create/update with an image)
+    Rule("uploads", ["POST", "PUT"], r"^/api/", rate=RATE_LIMIT_UPLOADS,
+         concurrency=CONCURRENCY_LIMIT_UPLOADS, multipart_only=True, max_body=upload_body_limit),
+)
+
+
+class AdmissionControl:
+    """Rate limiting and load shedding in front of the public write routes.
+
+    The first rule matching a request applies. Each client IP gets a token
+    bucket per rule; an empty bucket answers 429. Rules with a concurrency
+    limit answer 503 while that many of their requests are already running.
+    Both happen before the body is read, so a rejected upload costs nothing;
+    both carry Retry-After. Rules with a body limit answer 413 for a larger
+    Content-Length up front, and stop reading a body (413) as soon as it
+    runs past the limit. Counters are per process.
+
+    Installed with ``app.add_middleware(AdmissionMiddleware, control=...)``.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, proxy_hops: int = TRUSTED_PROXY_HOPS,
+                 retry_after: int = ADMISSION_RETRY_AFTER, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.rules = rules
+        self.proxy_hops = proxy_hops
+        self.retry_after = retry_after
+        self.max_clients = max_clients
+        # (rule name, client) -> [tokens, last refill]
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        self._warned_proxy = False
+
+    def client_ip(self, scope) -> str:
+        if self.proxy_hops > 0:
+            forwarded = [p.strip() for p in Headers(scope=scope).get("x-forwarded-for", "").split(",") if p.strip()]
+            if len(forwarded) >= self.proxy_hops:
+                return forwarded[-self.proxy_hops]
+        client = scope.get("client")
+        peer = client[0] if client else "unknown"
+        if not self.proxy_hops and not self._warned_proxy:
+            self._check_proxy(scope, peer)
+        return peer
+
+    def _check_proxy(self, scope, peer: str):
+        # A forwarded request from a private address means a proxy sits in
+        # front: every client then shares that proxy's buckets
+        if "x-forwarded-for" not in Headers(scope=scope):
+            return
+        try:
+            private = ipaddress.ip_address(peer).is_private
+        except ValueError:
+            return
+        if private:
+            self._warned_proxy = True
+            print(f"Warning: requests arrive through a proxy ({peer}) but TRUSTED_PROXY_HOPS is 0, "
+                  "so rate limits are shared by all clients. Set TRUSTED_PROXY_HOPS=1 (see ENV_VARIABLES.md).")
+
+    def _take(self, rule: Rule, client: str) -> float:
+        """Take a token; returns 0, or the seconds until one is available."""
+        capacity, period = rule.rate
+        refill = capacity / period
+        now = time.monotonic()
+        key = (rule.name, client)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._prune(now)
+            bucket = self._buckets[key] = [float(capacity), now]
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / refill
+
+    def _refund(self, rule: Rule, client: str):
+        bucket = self._buckets.get((rule.name, client))
+        if bucket is not None:
+            bucket[0] = min(rule.rate[0], bucket[0] + 1)
+
+    def _prune(self, now: float):
+        # Drop buckets that have refilled completely: they hold no state
+        rates = {rule.name: rule.rate for rule in self.rules if rule.rate}
+        for key, (tokens, updated) in list(self._buckets.items()):
+            capacity, period = rates[key[0]]
+            if tokens + (now - updated) * capacity / period >= capacity:
+                del self._buckets[key]
+        if len(self._buckets) >= self.max_clients:
+            # Still full (an attack from many addresses): start over
+            self._buckets.clear()
+
+    async def admit(self, scope, receive, send, app):
+        rule = next((r for r in self.rules if r.matches(scope)), None)
+        if rule is None:
+            await app(scope, receive, send)
+            return
+
+        limit = rule.body_limit(scope) if rule.max_body else None
+        if limit is not None:
+            length = Headers(scope=scope).get("content-length", "")
+            if length.isdigit() and int(length) > limit:
+                rule.too_large += 1
+                await JSONResponse({"detail": _too_large_detail(limit)}, status_code=413)(scope, receive, send)
+                return
+            receive = self._limit_body(receive, rule, limit)
+
+        client = self.client_ip(scope)
+        if rule.rate:
+            wait = self._take(rule, client)
+            if wait:
+                rule.rate_limited += 1
+                await self._reject(scope, receive, send, 429, "Too many requests, please slow down", wait)
+                return
+        if rule.concurrency and rule.in_flight >= rule.concurrency:
+            rule.shed += 1
+            if rule.rate:
+                self._refund(rule, client)
+            await self._reject(scope, receive, send, 503, "Server is busy, please retry shortly", self.retry_after)
+            return
+
+        rule.admitted += 1
+        rule.in_flight += 1
+        rule.peak_in_flight = max(rule.peak_in_flight, rule.in_flight)
+        try:
+            await app(scope, receive, send)
+        finally:
+            rule.in_flight -= 1
+
+    @staticmethod
+    def _limit_body(receive, rule: Rule, limit: int):
+        # For bodies without a Content-Length (chunked) or with a wrong one.
+        # Raised while the route parses its form, so FastAPI answers 413.
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    rule.too_large += 1
+                    raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+            return message
+
+        return limited_receive
+
+    @staticmethod
+    async def _reject(scope, receive, send, status: int, detail: str, retry_after: float):
+        headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+        await JSONResponse({"detail": detail}, status_code=status, headers=headers)(scope, receive, send)
+
+    def stats(self) -> dict:
+        return {
+            "clients_tracked": len(self._buckets),
+            "rules": {rule.name: rule.stats() for rule in self.rules},
+        }
+
+
+def _too_large_detail(limit: int) -> str:
+    return f"Request too large (max {limit // (1024 * 1024)} MB)"
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, control: AdmissionControl):
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.control.admit(scope, receive, send, self.app)
+
+
+admission = AdmissionControl()
@@ -0,0 +1,140 @@
+import asyncio
+import hmac
+import os
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+from sqlalchemy import select, update
+from starlette.concurrency import run_in_threadpool
+
+from . import models
+
+# ENV is what the Cloud Run workflow sets; .env.example uses ENVIRONMENT
+ENVIRONMENT = (os.getenv("ENV") or os.getenv("ENVIRONMENT") or "development").strip().lower()
+SECRET_KEY = os.getenv("SECRET_KEY")
+if not SECRET_KEY:
+    # A random key dies with the process and isn't accepted by other workers:
+    # with several of them, admins would be logged out on every other request
+    if ENVIRONMENT != "development":
+        raise RuntimeError("SECRET_KEY must be set (ENV is not development). See ENV_VARIABLES.md.")
+    SECRET_KEY = secrets.token_urlsafe(32)
+    print("Warning: SECRET_KEY not set. Using a random key; admins must log in again after a restart.")
+ALGORITHM = "HS256"
+ACCESS_TOKEN_MINUTES = int(os.getenv("ACCESS_TOKEN_MINUTES", "720"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# How long revocation epochs are cached. A revoked token can keep working on
+# other workers for up to this long.
+AUTH_EPOCH_TTL = float(os.getenv("AUTH_EPOCH_TTL", "5"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+# Verified against when the user doesn't exist, so both cases take as long
+_DUMMY_HASH = pwd_context.hash(secrets.token_urlsafe(16))
+
+
+async def hash_password(password: str) -> str:
+    # bcrypt takes ~0.2s of CPU by design: keep it off the event loop
+    return await run_in_threadpool(pwd_context.hash, password)
+
+
+async def verify_password(password: str, stored: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Check ``password``; returns (ok, new_hash).
+
+    ``new_hash`` is set when the stored value should be replaced: a legacy
+    plaintext password, or a hash made with outdated settings.
+    """
+    if stored and pwd_context.identify(stored, required=False) is None:
+        ok = hmac.compare_digest(password.encode(), stored.encode())
+        return ok, (await hash_password(password) if ok else None)
+    return await run_in_threadpool(pwd_context.verify_and_update, password, stored or _DUMMY_HASH)
+
+
+class AuthEpochs:
+    """Per-user revocation counters from ``auth_epochs``, cached in memory.
+
+    Access tokens carry the user's epoch at login; a token whose epoch is
+    behind the current one is rejected. All counters are read with one query
+    at most once per AUTH_EPOCH_TTL, so checking a token normally costs no
+    database round trip.
+    """
+
+    def __init__(self, session_factory, ttl: float = AUTH_EPOCH_TTL):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self._epochs: Dict[int, int] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def current(self, user_id: int) -> int:
+        if time.monotonic() - self._loaded_at > self.ttl:
+            async with self._lock:
+                # Another request may have reloaded while we waited
+                if time.monotonic() - self._loaded_at > self.ttl:
+                    async with self.session_factory() as session:
+                        result = await session.execute(select(models.AuthEpoch.user_id, models.AuthEpoch.epoch))
+                        self._epochs = dict(result.all())
+                    self._loaded_at = time.monotonic()
+        return self._epochs.get(user_id, 0)
+
+    @staticmethod
+    async def load(session, user_id: int) -> int:
+        # Uncached, for issuing tokens: must never be behind a revocation
+        result = await session.execute(select(models.AuthEpoch.epoch).where(models.AuthEpoch.user_id == user_id))
+        return result.scalar() or 0
+
+    async def bump(self, session, user_id: int):
+        """Revoke the user's existing tokens. Call before committing."""
+        Epoch = models.AuthEpoch
+        result = await session.execute(
+            update(Epoch).where(Epoch.user_id == user_id).values(epoch=Epoch.epoch + 1)
+        )
+        if result.rowcount == 0:
+            session.add(Epoch(user_id=user_id, epoch=1))
+        self._loaded_at = 0.0
+
+
+def create_access_token(user: models.AdminUser, epoch: int) -> str:
+    now = datetime.now(timezone.utc)
+    claims = {
+        "sub": str(user.id),
+        "email": user.email,
+        "role": user.role,
+        "ep": epoch,
+        "iat": now,
+        "exp": now + timedelta(minutes=ACCESS_TOKEN_MINUTES),
+    }
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def _unauthorized(detail: str):
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+class AdminAuth:
+    """FastAPI dependency: requires a valid admin access token.
+
+    Returns the token's claims. The signature and expiry are checked in
+    memory; the only shared state is the cached revocation epoch.
+    """
+
+    def __init__(self, epochs: AuthEpochs):
+        self.epochs = epochs
+
+    async def __call__(self, request: Request) -> dict:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise _unauthorized("Not authenticated")
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            user_id = int(claims["sub"])
+        except (JWTError, KeyError, ValueError):
+            raise _unauthorized("Invalid or expired token")
+        if claims.get("ep", 0) < await self.epochs.current(user_id):
+            raise _unauthorized("Token revoked")
+        if claims.get("role") != "admin":
+            raise HTTPException(status_code=403, detail="Admin access required")
+        return claims
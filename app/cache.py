@@ -0,0 +1,124 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+from fastapi import Request, Response
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+
+class CachedResponse:
+    __slots__ = ("body", "headers", "tags", "versions", "expires")
+
+    def __init__(self, body: bytes, headers: Dict[str, str], tags, versions, expires: float):
+        self.body = body
+        self.headers = headers
+        self.tags = tags
+        self.versions = versions
+        self.expires = expires
+
+
+class ResponseCache:
+    """TTL + LRU cache of serialized JSON responses, keyed by path and query.
+
+    Entries are tagged with the tables they were built from; write handlers
+    call ``invalidate(table)`` after committing. A body whose rows were read
+    before an invalidation of its tables (``generation()`` changed meanwhile)
+    is not stored. Invalidation is per process, so entries also carry the
+    tables' versions they were built at and ``get()`` only returns one whose
+    versions still match: another worker's write shows up once this process
+    re-reads the versions (TABLE_VERSION_TTL).
+    """
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        self._generations: Dict[str, int] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(request: Request) -> str:
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def get(self, request: Request, versions=None) -> Optional[Response]:
+        if self.ttl <= 0:
+            return None
+        key = self.key(request)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires < time.monotonic() or entry.versions != versions:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return Response(entry.body, media_type="application/json", headers=entry.headers)
+
+    def generation(self, tags) -> tuple:
+        """Read before loading the rows; pass to ``put()`` along with the body."""
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def put(self, request: Request, body: bytes, tags, headers: Optional[Dict[str, str]] = None,
+            versions=None, generation: Optional[tuple] = None) -> Response:
+        """Store a serialized body and return it as a Response.
+
+        Not stored if ``tags`` were invalidated since ``generation`` was read:
+        the rows may predate a write that committed while they were loading.
+        """
+        headers = {k: v for k, v in (headers or {}).items() if v}
+        if self.ttl > 0 and (generation is None or generation == self.generation(tags)):
+            key = self.key(request)
+            self._remove(key)
+            self._entries[key] = CachedResponse(body, headers, tuple(tags), versions, time.monotonic() + self.ttl)
+            self.bytes += len(body)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return Response(body, media_type="application/json", headers=headers)
+
+    def invalidate(self, *tags: str):
+        now = time.monotonic()
+        for tag in tags:
+            for key in self._by_tag.pop(tag, ()):
+                self._remove(key)
+            self._invalidated_at[tag] = now
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        self.invalidations += 1
+
+    def changed_within(self, tags, seconds: float) -> bool:
+        """True if any of ``tags`` was invalidated in the last ``seconds``."""
+        since = time.monotonic() - seconds
+        return any(self._invalidated_at.get(tag, 0.0) > since for tag in tags)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys:
+                keys.discard(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
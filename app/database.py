@@ -1,45 +1,204 @@
 import os
+import time
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from fastapi import Request
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Determine if we are using MySQL (TiDB Cloud) or SQLite
-if DATABASE_URL and "mysql" in DATABASE_URL:
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Engine / pool settings. Size the pool so that
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays under the server's
+# connection limit (TiDB Cloud Serverless allows only a few hundred).
+DB_ECHO = _env_bool("DB_ECHO", False)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle before the server / proxy drops idle connections
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "280"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# SQLite tuning, applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "32"))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait to get a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+def build_engine(url, connect_args=None, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW):
+    return create_async_engine(
+        url,
+        connect_args=connect_args or {},
+        echo=DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+def _sqlite_pragmas(read_only: bool):
+    def on_connect(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # WAL lets readers run while the writer commits. The mode is stored
+            # in the database file, so only the writer needs to set it.
+            cursor.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL: a power loss can drop the last commits but not corrupt the file
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_MB * 1024 * 1024}")
+        # Negative cache_size is in KiB
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_MB * 1024}")
+        cursor.close()
+    return on_connect
+
+
+def build_mysql_engine(url):
     # Convert mysql:// to mysql+aiomysql:// for async support
-    if "mysql+aiomysql://" not in DATABASE_URL:
-        DATABASE_URL = DATABASE_URL.replace("mysql://", "mysql+aiomysql://")
-    
+    if "mysql+aiomysql://" not in url:
+        url = url.replace("mysql://", "mysql+aiomysql://")
+
     # Handle SSL for TiDB Cloud
     connect_args = {}
-    if "ssl" in DATABASE_URL:
+    if "ssl" in url:
         # TiDB Cloud works well with a simple ssl=True or an SSLContext
         import ssl
         ctx = ssl.create_default_context()
         ctx.check_hostname = False
         ctx.verify_mode = ssl.CERT_NONE  # In production, use real CA
         connect_args["ssl"] = ctx
-        
+
         # Clean URL to avoid issues with query params being passed twice
-        if "?" in DATABASE_URL:
-            DATABASE_URL = DATABASE_URL.split("?")[0]
+        if "?" in url:
+            url = url.split("?")[0]
+
+    return build_engine(url, connect_args)
 
-    engine = create_async_engine(DATABASE_URL, connect_args=connect_args, echo=True)
+
+# Determine if we are using MySQL (TiDB Cloud) or SQLite
+if DATABASE_URL and "mysql" in DATABASE_URL:
+    engine = build_mysql_engine(DATABASE_URL)
+    read_engine = engine
 else:
     # Default to local SQLite
-    DB_PATH = os.path.join(os.path.dirname(__file__), "..", "server", "database.sqlite")
+    DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "server", "database.sqlite"))
     DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
-    engine = create_async_engine(DATABASE_URL, echo=True)
+    # SQLite allows one writer at a time: a single pooled connection makes
+    # writes queue in the pool instead of failing with "database is locked"
+    engine = build_engine(DATABASE_URL, pool_size=1, max_overflow=0)
+    event.listen(engine.sync_engine, "connect", _sqlite_pragmas(read_only=False))
+    # Reads go through their own read-only connections and run in parallel
+    read_engine = build_engine(
+        f"sqlite+aiosqlite:///file:{DB_PATH}?mode=ro&uri=true",
+        pool_size=SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+    )
+    event.listen(read_engine.sync_engine, "connect", _sqlite_pragmas(read_only=True))
+
+# Optional read replica for GET handlers (MySQL/TiDB, or another SQLite file
+# when testing locally). Replicas can lag the primary, so clients that have
+# just written are pinned to the primary for DB_READ_STICKY_SECONDS.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+DB_READ_STICKY_SECONDS = int(os.getenv("DB_READ_STICKY_SECONDS", "10"))
+READ_STICKY_COOKIE = "db_primary"
+replica_engine = None
+if DATABASE_READ_URL:
+    if "mysql" in DATABASE_READ_URL:
+        replica_engine = build_mysql_engine(DATABASE_READ_URL)
+    else:
+        replica_engine = build_engine(DATABASE_READ_URL)
+        if replica_engine.dialect.name == "sqlite":
+            event.listen(replica_engine.sync_engine, "connect", _sqlite_pragmas(read_only=True))
+    read_engine = replica_engine
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 Base = declarative_base()
 
+def pool_stats() -> dict:
+    stats = {"backend": engine.dialect.name, **engine.pool.stats()}
+    if read_engine is not engine:
+        stats["read"] = read_engine.pool.stats()
+    return stats
+
+def ensure_indexes(connection):
+    # create_all() skips tables that already exist, so indexes added to the
+    # models later have to be created separately on existing databases
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+def reads_from_replica(session: AsyncSession) -> bool:
+    return replica_engine is not None and session.bind is replica_engine
+
+def read_session_factory(request: Request):
+    # The primary for clients that just wrote (see READ_STICKY_COOKIE)
+    if replica_engine is not None and request.cookies.get(READ_STICKY_COOKIE):
+        return AsyncSessionLocal
+    return ReadSessionLocal
+
+async def get_read_db(request: Request):
+    # For handlers that only read; never write through this session
+    async with read_session_factory(request)() as session:
+        yield session
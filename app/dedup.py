@@ -0,0 +1,156 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import or_, select
+
+from . import models
+from .imaging import image_pool, perceptual_hash
+from .ingest import IngestedUpload
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# Max Hamming distance between perceptual hashes to count as the same photo.
+# 0 turns near-duplicate matching off (exact byte matches only). The band
+# index only guarantees finding matches up to 3 bits apart.
+DEDUP_PHASH_DISTANCE = min(int(os.getenv("DEDUP_PHASH_DISTANCE", "0")), 3)
+_NEAR_CANDIDATES = 50
+
+
+def _signed(value: int) -> int:
+    # BIGINT is signed; store the unsigned 64-bit hash in two's complement
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _bands(value: int) -> list:
+    return [(value >> (16 * i)) & 0xFFFF for i in range(4)]
+
+
+class UploadIndex:
+    """Reuses the Cloudinary asset of an earlier upload of the same image.
+
+    Uploads are looked up by the SHA-256 of the original bytes (computed while
+    streaming) and, if DEDUP_PHASH_DISTANCE > 0, by perceptual hash. A match
+    returns the stored URL without re-encoding or uploading anything. Assets
+    queued for deletion are never reused. Identical files arriving at the same
+    time (e.g. twice in one batch) share a single upload.
+
+    Lookups use their own read session, so they never touch (or wait for) the
+    caller's session; new fingerprints are added to the caller's session and
+    committed with the row that uses them.
+    """
+
+    def __init__(self, read_session_factory, enabled: bool = DEDUP_ENABLED,
+                 phash_distance: int = DEDUP_PHASH_DISTANCE):
+        self.read_session_factory = read_session_factory
+        self.enabled = enabled
+        self.phash_distance = phash_distance
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    async def store(self, db, upload: IngestedUpload, upload_new: Callable[[], Awaitable[dict]]) -> str:
+        """Return the URL for ``upload``, calling ``upload_new()`` only when there's no match."""
+        if not self.enabled:
+            return (await upload_new()).get("secure_url")
+
+        key = upload.sha256
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.shared += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            url = await self._store(db, upload, key, upload_new)
+            future.set_result(url)
+            return url
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _store(self, db, upload: IngestedUpload, key: str, upload_new) -> str:
+        match = await self._find_exact(key)
+        if match:
+            self.exact_hits += 1
+            return match.url
+
+        phash = None
+        if self.phash_distance > 0:
+            try:
+                phash = await image_pool.run(perceptual_hash, upload.source)
+            except Exception:
+                # Not an image Pillow can read, or the pool is full: exact match only
+                phash = None
+            if phash is not None:
+                match = await self._find_near(phash)
+                if match:
+                    self.near_hits += 1
+                    self._remember(db, key, phash, match.public_id, match.url)
+                    return match.url
+
+        self.misses += 1
+        result = await upload_new()
+        self._remember(db, key, phash, result.get("public_id"), result.get("secure_url"))
+        return result.get("secure_url")
+
+    def _live(self):
+        Fp, Asset = models.UploadFingerprint, models.CloudinaryAsset
+        return (
+            select(Fp.url, Fp.public_id, Fp.phash)
+            .join(Asset, Asset.public_id == Fp.public_id)
+            .where(Asset.queued_at.is_(None))
+        )
+
+    async def _find_exact(self, key: str):
+        async with self.read_session_factory() as session:
+            result = await session.execute(self._live().where(models.UploadFingerprint.sha256 == key).limit(1))
+            return result.first()
+
+    async def _find_near(self, phash: int):
+        Fp = models.UploadFingerprint
+        bands = _bands(phash)
+        async with self.read_session_factory() as session:
+            result = await session.execute(
+                self._live()
+                .where(or_(Fp.band0 == bands[0], Fp.band1 == bands[1], Fp.band2 == bands[2], Fp.band3 == bands[3]))
+                .limit(_NEAR_CANDIDATES)
+            )
+            candidates = result.all()
+        best, best_distance = None, self.phash_distance + 1
+        for row in candidates:
+            distance = bin((row.phash & ((1 << 64) - 1)) ^ phash).count("1")
+            if distance < best_distance:
+                best, best_distance = row, distance
+        return best
+
+    @staticmethod
+    def _remember(db, key: str, phash: Optional[int], public_id: Optional[str], url: Optional[str]):
+        if not public_id or not url:
+            return
+        bands = _bands(phash) if phash is not None else [None] * 4
+        db.add(models.UploadFingerprint(
+            sha256=key,
+            phash=_signed(phash) if phash is not None else None,
+            band0=bands[0], band1=bands[1], band2=bands[2], band3=bands[3],
+            public_id=public_id,
+            url=url,
+        ))
+
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.near_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "phash_distance": self.phash_distance,
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.near_hits) / lookups, 4) if lookups else 0.0,
+        }
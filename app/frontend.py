@@ -0,0 +1,159 @@
+import gzip
+import mimetypes
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+try:
+    # Optional: browsers prefer Brotli, and it is ~15-20% smaller than gzip for JS/CSS
+    import brotli
+except ImportError:
+    brotli = None
+
+# Build output worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = {".js", ".mjs", ".css", ".html", ".svg", ".json", ".txt", ".xml", ".map", ".ico", ".webmanifest"}
+PRECOMPRESS_MIN_BYTES = 1024
+# Vite names build assets "<name>-<hash>.<ext>"; those never change content
+HASHED_ASSET = re.compile(r"-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "3600"))
+
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(request: Request) -> set:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _encodings():
+    return [(name, suffix) for name, suffix in ENCODINGS if name != "br" or brotli is not None]
+
+
+class FrontendFiles:
+    """Serves the Vite build: static files, and index.html for SPA routes.
+
+    ``index.html`` is kept in memory (plus gzip/br copies) and reloaded when
+    its mtime changes. Other files are served from disk, preferring a
+    ``.br``/``.gz`` sibling when the client accepts it. ``precompress()``
+    writes those siblings for the build output that doesn't have them yet.
+    """
+
+    def __init__(self, build_dir: str):
+        self.build_dir = os.path.realpath(build_dir)
+        self.index_path = os.path.join(self.build_dir, "index.html")
+        self._index: Dict[str, bytes] = {}
+        self._index_mtime = None
+        self._index_etag = None
+        self._lock = threading.Lock()
+        # Precompressed siblings known to exist: path -> {encoding: path}
+        self._variants: Dict[str, Dict[str, str]] = {}
+
+    def precompress(self):
+        """Write missing or outdated .br/.gz siblings. Blocking - run in a thread."""
+        for root, _, files in os.walk(self.build_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+                    continue
+                size = os.path.getsize(path)
+                if size < PRECOMPRESS_MIN_BYTES:
+                    continue
+                variants = {}
+                data = None
+                for encoding, suffix in _encodings():
+                    target = path + suffix
+                    try:
+                        fresh = os.path.getmtime(target) >= os.path.getmtime(path)
+                    except OSError:
+                        fresh = False
+                    if not fresh:
+                        if data is None:
+                            with open(path, "rb") as f:
+                                data = f.read()
+                        compressed = compress(data, encoding)
+                        if len(compressed) >= size:
+                            continue
+                        tmp = f"{target}.tmp"
+                        with open(tmp, "wb") as f:
+                            f.write(compressed)
+                        os.replace(tmp, target)
+                    variants[encoding] = target
+                self._variants[path] = variants
+
+    def resolve(self, rel_path: str) -> Optional[str]:
+        path = os.path.realpath(os.path.join(self.build_dir, rel_path))
+        if not path.startswith(self.build_dir + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def file_response(self, request: Request, path: str) -> Response:
+        rel = os.path.relpath(path, self.build_dir)
+        hashed = rel.startswith("assets" + os.sep) and HASHED_ASSET.search(rel)
+        headers = {"Cache-Control": IMMUTABLE if hashed else f"public, max-age={STATIC_MAX_AGE}"}
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+        served = path
+        variants = self._variants.get(path, {})
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(request)
+            for encoding, _ in ENCODINGS:
+                if encoding in variants and encoding in accepted:
+                    served = variants[encoding]
+                    headers["Content-Encoding"] = encoding
+                    break
+
+        response = FileResponse(served, media_type=media_type, headers=headers, stat_result=os.stat(served))
+        if request.headers.get("if-none-match") == response.headers.get("etag"):
+            return Response(status_code=304, headers={k: v for k, v in response.headers.items()
+                                                      if k in ("etag", "cache-control", "vary")})
+        return response
+
+    def _load_index(self):
+        mtime = os.stat(self.index_path).st_mtime_ns
+        if mtime == self._index_mtime:
+            return
+        with self._lock:
+            if mtime == self._index_mtime:
+                return
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            index = {"identity": data}
+            for encoding, _ in _encodings():
+                index[encoding] = compress(data, encoding)
+            self._index = index
+            # Weak: the same tag covers the identity, gzip and br bodies
+            self._index_etag = f'W/"{mtime:x}-{len(data):x}"'
+            self._index_mtime = mtime
+
+    def index_response(self, request: Request) -> Optional[Response]:
+        try:
+            self._load_index()
+        except OSError:
+            return None
+        # Must revalidate: a new deploy changes the hashed asset names it points to
+        headers = {"Cache-Control": "no-cache", "ETag": self._index_etag, "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") == self._index_etag:
+            return Response(status_code=304, headers=headers)
+        accepted = accepted_encodings(request)
+        for encoding, _ in ENCODINGS:
+            if encoding in self._index and encoding in accepted:
+                headers["Content-Encoding"] = encoding
+                return Response(self._index[encoding], media_type="text/html", headers=headers)
+        return Response(self._index["identity"], media_type="text/html", headers=headers)
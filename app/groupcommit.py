@@ -0,0 +1,183 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from .versions import table_versions
+
+# "off": every submission commits on its own (default).
+# "commit": submissions are batched; each request waits for its batch's commit.
+# "ack": requests return as soon as the row is queued. Fastest, but rows still
+#        queued are lost if the process crashes (a clean shutdown flushes them).
+VOLUNTEER_WRITE_BEHIND = os.getenv("VOLUNTEER_WRITE_BEHIND", "off").strip().lower()
+WRITE_BEHIND_FLUSH_MS = float(os.getenv("WRITE_BEHIND_FLUSH_MS", "50"))
+WRITE_BEHIND_MAX_ROWS = int(os.getenv("WRITE_BEHIND_MAX_ROWS", "500"))
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+WRITE_BEHIND_RETRIES = 3
+WRITE_BEHIND_RETRY_AFTER = 5
+
+
+class WriterBusy(Exception):
+    """Raised when the queue is full; callers should answer 503."""
+
+    def __init__(self, retry_after: int = WRITE_BEHIND_RETRY_AFTER):
+        super().__init__("Write queue is full")
+        self.retry_after = retry_after
+
+
+class GroupCommitWriter:
+    """Batches single-row inserts into one multi-row INSERT and one commit.
+
+    Rows are queued by ``submit()`` and written by a background task as soon
+    as ``max_rows`` are waiting or ``flush_ms`` after the first one arrived.
+    The table version is bumped in the same transaction and ``on_commit`` is
+    called with the table name afterwards, like the regular write handlers.
+    A failed batch is retried a few times before it is dropped. ``stop()``
+    writes everything still queued.
+    """
+
+    def __init__(self, session_factory, model, on_commit: Optional[Callable] = None,
+                 wait_for_commit: bool = True, flush_ms: float = WRITE_BEHIND_FLUSH_MS,
+                 max_rows: int = WRITE_BEHIND_MAX_ROWS, max_queue: int = WRITE_BEHIND_MAX_QUEUE,
+                 timestamp_column: Optional[str] = None):
+        self.session_factory = session_factory
+        self.model = model
+        self.table = model.__tablename__
+        self.on_commit = on_commit
+        self.wait_for_commit = wait_for_commit
+        self.flush_ms = flush_ms
+        self.max_rows = max_rows
+        self.max_queue = max_queue
+        # Stamped at submission, so batching doesn't change the row order
+        self.timestamp_column = timestamp_column
+        self._pending: List[Tuple[dict, Optional[asyncio.Future]]] = []
+        self._task = None
+        self._wakeup = None
+        self._full = None
+        self._closing = False
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.rejected = 0
+        self.retries = 0
+        self.dropped = 0
+        self.peak_depth = 0
+        self.flush_ms_total = 0.0
+        self.flush_ms_max = 0.0
+        self.last_flush_ms = None
+        self.last_error = None
+
+    def start(self):
+        if self._task is None:
+            self._closing = False
+            self._wakeup = asyncio.Event()
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Flush every queued row, then stop the background task."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        self._full.set()
+        await self._task
+        self._task = None
+
+    async def submit(self, row: dict):
+        if self._task is None or self._closing:
+            raise RuntimeError("Writer is not running")
+        if len(self._pending) >= self.max_queue:
+            self.rejected += 1
+            raise WriterBusy()
+        if self.timestamp_column:
+            row.setdefault(self.timestamp_column, datetime.now(timezone.utc).replace(tzinfo=None))
+        future = asyncio.get_running_loop().create_future() if self.wait_for_commit else None
+        self._pending.append((row, future))
+        self.submitted += 1
+        self.peak_depth = max(self.peak_depth, len(self._pending))
+        if len(self._pending) >= self.max_rows:
+            self._full.set()
+        self._wakeup.set()
+        if future is not None:
+            # A client disconnecting mustn't cancel the shared batch result
+            await asyncio.shield(future)
+
+    async def _loop(self):
+        while True:
+            if not self._pending:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if len(self._pending) < self.max_rows and not self._closing:
+                # Give more rows flush_ms to join this batch
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            await self._flush()
+
+    async def _flush(self):
+        batch = self._pending[:self.max_rows]
+        del self._pending[:self.max_rows]
+        rows = [row for row, _ in batch]
+        started = time.perf_counter()
+        error = None
+        for attempt in range(WRITE_BEHIND_RETRIES + 1):
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(insert(self.model), rows)
+                    await table_versions.bump(session, self.table)
+                    await session.commit()
+                table_versions.invalidate()
+                error = None
+                break
+            except Exception as e:
+                error = e
+                if attempt < WRITE_BEHIND_RETRIES:
+                    self.retries += 1
+                    await asyncio.sleep(0.1 * 2 ** attempt)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        self.last_flush_ms = round(elapsed, 2)
+        self.flush_ms_max = max(self.flush_ms_max, elapsed)
+        self.flush_ms_total += elapsed
+        self.batches += 1
+        if error is not None:
+            self.dropped += len(rows)
+            self.last_error = str(error)
+            print(f"Dropped {len(rows)} queued {self.table} rows after {WRITE_BEHIND_RETRIES} retries: {error}")
+        else:
+            self.written += len(rows)
+            if self.on_commit:
+                self.on_commit(self.table)
+        for _, future in batch:
+            if future is not None and not future.done():
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(WriterBusy())
+
+    def stats(self) -> dict:
+        return {
+            "mode": "commit" if self.wait_for_commit else "ack",
+            "queue_depth": len(self._pending),
+            "peak_queue_depth": self.peak_depth,
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "avg_batch_rows": round(self.written / self.batches, 1) if self.batches else 0.0,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "last_flush_ms": self.last_flush_ms,
+            "avg_flush_ms": round(self.flush_ms_total / self.batches, 2) if self.batches else None,
+            "max_flush_ms": round(self.flush_ms_max, 2),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,228 @@
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+from PIL import Image
+
+try:
+    # Optional AVIF encoder for Pillow versions without native AVIF support
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+# Pillow work runs in worker processes so a large decode/resize/encode never
+# blocks the event loop. IMAGE_WORKERS=0 falls back to a thread (for hosts
+# that don't allow spawning processes).
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(2, os.cpu_count() or 1))))
+IMAGE_MAX_IN_FLIGHT = int(os.getenv("IMAGE_MAX_IN_FLIGHT", str(max(IMAGE_WORKERS, 1))))
+IMAGE_QUEUE_SIZE = int(os.getenv("IMAGE_QUEUE_SIZE", "16"))
+IMAGE_RETRY_AFTER = int(os.getenv("IMAGE_RETRY_AFTER", "5"))
+
+MAX_WIDTH = 1920
+
+
+def _can_save(format_name: str) -> bool:
+    Image.init()
+    return format_name in Image.SAVE
+
+
+# Output formats in order of preference. JPEG is always available and is the fallback.
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+OUTPUT_FORMATS = [f for f in ("avif", "webp") if _can_save(f.upper())] + ["jpeg"]
+
+# Format of the master copy we upload. Cloudinary re-encodes on delivery (f_auto),
+# so JPEG stays the safe default; webp/avif shrink storage further.
+UPLOAD_IMAGE_FORMAT = os.getenv("UPLOAD_IMAGE_FORMAT", "jpeg").lower()
+if UPLOAD_IMAGE_FORMAT not in OUTPUT_FORMATS:
+    UPLOAD_IMAGE_FORMAT = "jpeg"
+
+ENCODE_OPTIONS = {
+    "jpeg": {"format": "JPEG", "quality": 85, "optimize": True, "progressive": True},
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60, "speed": 6},
+    "png": {"format": "PNG", "optimize": True},
+}
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Pick the best output format the client explicitly accepts (q > 0).
+
+    Wildcards don't count: browsers that can decode WebP/AVIF list them by name.
+    """
+    accepted = set()
+    for part in (accept or "").split(","):
+        media, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(media.strip().lower())
+    for fmt in OUTPUT_FORMATS:
+        if MIME_TYPES[fmt] in accepted:
+            return fmt
+    return "jpeg"
+
+
+def has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+
+def encode_image(img: Image.Image, fmt: str, quality: Optional[int] = None) -> bytes:
+    """Encode with the per-format settings; JPEG output is flattened onto white."""
+    if fmt == "jpeg":
+        if has_alpha(img):
+            rgba = img.convert("RGBA")
+            background = Image.new("RGB", rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            img = background
+        elif img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if has_alpha(img) else "RGB")
+    options = dict(ENCODE_OPTIONS[fmt])
+    if quality is not None:
+        options["quality"] = quality
+    output = io.BytesIO()
+    img.save(output, **options)
+    return output.getvalue()
+
+
+class ImagePoolBusy(Exception):
+    """Raised when the image queue is full; callers should answer 503."""
+
+    def __init__(self, retry_after: int = IMAGE_RETRY_AFTER):
+        super().__init__("Image processing queue is full")
+        self.retry_after = retry_after
+
+
+def _open(source: Union[str, bytes]) -> Image.Image:
+    return Image.open(source if isinstance(source, str) else io.BytesIO(source))
+
+
+def optimize_image(source: Union[str, bytes], fmt: str = UPLOAD_IMAGE_FORMAT) -> bytes:
+    """Resize to at most MAX_WIDTH and re-encode as ``fmt``. Runs in a worker process.
+
+    ``source`` is a file path (spooled upload) or the raw bytes of a small one.
+    Transparent images never go to JPEG (logos would get a solid background);
+    they are written as WebP, or PNG if WebP isn't available.
+    """
+    with _open(source) as img:
+        if fmt == "jpeg" and has_alpha(img):
+            fmt = "webp" if "webp" in OUTPUT_FORMATS else "png"
+        if img.width > MAX_WIDTH:
+            # JPEG: have libjpeg decode at 1/2, 1/4 or 1/8 scale directly, so a
+            # huge panorama is never materialised at full resolution
+            img.draft("RGB", (MAX_WIDTH, max(1, img.height * MAX_WIDTH // img.width)))
+        img.load()
+        if img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA" if has_alpha(img) else "RGB")
+
+        # Resize if dimensions are massive (max 1920px width)
+        if img.width > MAX_WIDTH:
+            # Cheap box reduce by an integer factor first, LANCZOS for the rest
+            factor = img.width // MAX_WIDTH
+            if factor >= 2:
+                img = img.reduce(factor)
+            ratio = MAX_WIDTH / img.width
+            new_height = max(1, int(img.height * ratio))
+            img = img.resize((MAX_WIDTH, new_height), Image.Resampling.LANCZOS)
+
+        return encode_image(img, fmt)
+
+
+def perceptual_hash(source: Union[str, bytes]) -> int:
+    """64-bit difference hash (dHash). Runs in a worker process.
+
+    Re-encoded, resized or slightly recompressed copies of a photo hash to
+    the same value or differ in a few bits; different photos differ in many.
+    """
+    with _open(source) as img:
+        img.draft("L", (64, 64))
+        small = img.convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+        pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+class ImagePool:
+    """Process pool with a max-in-flight limit and a bounded wait queue.
+
+    At most ``max_in_flight`` jobs run at once; up to ``queue_size`` more may
+    wait for a slot. Anything beyond that is rejected immediately with
+    ImagePoolBusy instead of piling up memory behind the workers.
+    """
+
+    def __init__(self, workers: int = IMAGE_WORKERS, max_in_flight: int = IMAGE_MAX_IN_FLIGHT,
+                 queue_size: int = IMAGE_QUEUE_SIZE):
+        self.workers = workers
+        self.max_in_flight = max(max_in_flight, 1)
+        self.queue_size = queue_size
+        self._executor = None
+        self._slots = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None and self.workers > 0:
+            # spawn, not fork: forking a process that owns an event loop and
+            # DB connections is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        if self._slots.locked() and self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise ImagePoolBusy()
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_in_flight": self.max_in_flight,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+image_pool = ImagePool()
@@ -0,0 +1,110 @@
+import hashlib
+import io
+import os
+import tempfile
+from typing import Optional, Union
+
+from fastapi import HTTPException, UploadFile
+
+UPLOAD_MAX_BYTES = int(float(os.getenv("UPLOAD_MAX_MB", "50")) * 1024 * 1024)
+# Uploads smaller than this stay in memory; larger ones are spooled to disk
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_KB", "1024")) * 1024
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None
+CHUNK_SIZE = 256 * 1024
+
+
+class IngestedUpload:
+    """An upload copied out of the request in bounded chunks.
+
+    Small files are kept as bytes; anything over UPLOAD_SPOOL_BYTES lives in a
+    named temp file so image workers can open it by path instead of having the
+    whole file pickled across the process boundary.
+    """
+
+    def __init__(self, filename: Optional[str], content_type: Optional[str]):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.path: Optional[str] = None
+        self._buffer = io.BytesIO()
+        self._file = None
+        # Hashed while streaming, for the upload dedup index
+        self._sha256 = hashlib.sha256()
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        self._sha256.update(chunk)
+        if self._file is None and self.size > UPLOAD_SPOOL_BYTES:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload-", dir=UPLOAD_TMP_DIR, delete=False)
+            self.path = self._file.name
+            self._file.write(self._buffer.getvalue())
+            self._buffer = None
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer.write(chunk)
+
+    def finish(self):
+        if self._file is not None:
+            self._file.close()
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    @property
+    def source(self) -> Union[str, bytes]:
+        """Path for spooled uploads, bytes for in-memory ones (what image workers accept)."""
+        return self.path if self.path else self._buffer.getvalue()
+
+    def read_bytes(self) -> bytes:
+        if self.path:
+            with open(self.path, "rb") as f:
+                return f.read()
+        return self._buffer.getvalue()
+
+    def close(self):
+        self.finish()
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def ingest_upload(file: UploadFile, max_bytes: int = UPLOAD_MAX_BYTES) -> IngestedUpload:
+    """Copy an UploadFile out in chunks, rejecting it with 413 if it is over max_bytes.
+
+    By now Starlette has already received and spooled the whole request; the
+    request size itself is capped earlier, by AdmissionControl, before any
+    of the body is read.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File too large (max {max_bytes // (1024 * 1024)} MB)",
+    )
+    # Starlette already knows the size once the multipart body is parsed
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    upload = IngestedUpload(file.filename, file.content_type)
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            upload.write(chunk)
+            if upload.size > max_bytes:
+                raise too_large
+        upload.finish()
+    except BaseException:
+        upload.close()
+        raise
+    return upload
@@ -1,55 +1,88 @@
 import os
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete, update
 from typing import List, Optional
 import cloudinary
-import cloudinary.uploader
 from dotenv import load_dotenv
 import sys
 import asyncio
-from PIL import Image
 import io
 
+# Uploads smaller than this are sent as is; everything else is resized/re-encoded
+IMAGE_OPTIMIZE_MIN_BYTES = int(os.getenv("IMAGE_OPTIMIZE_MIN_KB", "512")) * 1024
+
 # Helper to optimize images before upload (Fixes Cloudinary 10MB limit)
-async def process_image(file: UploadFile) -> io.BytesIO:
-    contents = await file.read()
-    
-    # Check size - if small enough (e.g. < 5MB), just return original
-    if len(contents) < 5 * 1024 * 1024:
-        return io.BytesIO(contents)
-        
+async def process_image(upload: "IngestedUpload") -> io.BytesIO:
+    # Check size - if small enough, just return original
+    if upload.size < IMAGE_OPTIMIZE_MIN_BYTES:
+        return io.BytesIO(upload.read_bytes())
+
     try:
-        img = Image.open(io.BytesIO(contents))
-        
-        # Convert RGBA to RGB if needed (for proper JPEG saving)
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-            
-        # Resize if dimensions are massive (max 1920px width)
-        max_width = 1920
-        if img.width > max_width:
-            ratio = max_width / img.width
-            new_height = int(img.height * ratio)
-            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-            
-        # Save to buffer with compression
-        output = io.BytesIO()
-        img.save(output, format="JPEG", quality=85, optimize=True)
-        output.seek(0)
-        return output
+        # Decode/resize/encode happens in the image worker pool, off the event loop.
+        # Workers read spooled uploads from disk by path.
+        optimized = await image_pool.run(optimize_image, upload.source)
+    except ImagePoolBusy as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Image processing is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         print(f"Image processing failed: {e}")
-        # If processing fails (e.g. not an image), try returning original
-        return io.BytesIO(contents)
+        optimized = None
+    # Keep the original if processing failed (e.g. not an image) or didn't
+    # actually make it smaller
+    if optimized is None or len(optimized) >= upload.size:
+        return io.BytesIO(upload.read_bytes())
+    return io.BytesIO(optimized)
+
+# Optimize + upload an image to Cloudinary, returning its secure URL. The asset
+# is recorded in ``db`` so the reaper can delete it once nothing uses it.
+# Re-uploads of an image we already have reuse its URL (see dedup.py).
+async def store_upload(file: UploadFile, db: AsyncSession) -> str:
+    # Stream the upload in chunks (spooled to disk when large) instead of one big read
+    with await ingest_upload(file) as upload:
+        async def upload_new() -> dict:
+            processed_file = await process_image(upload)
+            try:
+                upload_result = await upload_service.upload(processed_file)
+            except UploadError as e:
+                raise HTTPException(status_code=502, detail=f"Image upload failed: {e}")
+            AssetReaper.record(db, upload_result)
+            return upload_result
+
+        return await upload_index.store(db, upload, upload_new)
 
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-from .database import engine, Base, get_db
+from .database import (
+    engine, Base, AsyncSessionLocal, ReadSessionLocal, get_db, get_read_db, ensure_indexes, pool_stats,
+    reads_from_replica, replica_engine, DB_READ_STICKY_SECONDS, READ_STICKY_COOKIE,
+)
 from . import models, schemas
+from .thumbnails import ThumbnailCache
+from .imaging import image_pool, optimize_image, negotiate_format, ImagePoolBusy, MIME_TYPES
+from .uploads import upload_service, UploadError
+from .ingest import ingest_upload, IngestedUpload
+from .pagination import Keyset, page_limit, encode_cursor, decode_cursor, PAGE_MAX_LIMIT, NEXT_CURSOR_HEADER
+from .cache import ResponseCache
+from .versions import table_versions, make_etag, etag_matches
+from .serialization import FieldSet, schema_columns, rows_to_json, dumps
+from .reaper import AssetReaper
+from .dedup import UploadIndex
+from .frontend import FrontendFiles
+from .compression import JSONGZipMiddleware
+from .export import export_response
+from .search import search_index, search_terms, SEARCH_KINDS, SEARCH_TABLES, SEARCH_PAGE_SIZE
+from .groupcommit import GroupCommitWriter, WriterBusy, VOLUNTEER_WRITE_BEHIND
+from .admission import AdmissionMiddleware, admission
+from .auth import AuthEpochs, AdminAuth, hash_password, verify_password, create_access_token, ACCESS_TOKEN_MINUTES
 
 load_dotenv()
 
@@ -63,20 +96,39 @@ if allowed_origins == "*":
 else:
     origins_list = [origin.strip() for origin in allowed_origins.split(",")]
 
+# Throttles public writes and sheds upload/login bursts before any work starts.
+# Added first so CORS headers still go on its 429/503 responses.
+app.add_middleware(AdmissionMiddleware, control=admission)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Retry-After"],
 )
+# Large JSON lists compress 5-10x; frontend files are precompressed instead
+app.add_middleware(JSONGZipMiddleware)
+
+if replica_engine is not None and DB_READ_STICKY_SECONDS > 0:
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        # After a successful write, pin this client's reads to the primary
+        # (see get_read_db) until the replica has had time to catch up
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            response.set_cookie(READ_STICKY_COOKIE, "1", max_age=DB_READ_STICKY_SECONDS,
+                                httponly=True, samesite="lax")
+        return response
 
 
 # Cloudinary Config
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
     api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET")
+    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+    # Optional override, e.g. to point uploads at a local fake server in tests
+    upload_prefix=os.getenv("CLOUDINARY_UPLOAD_PREFIX") or None,
 )
 
 # Setup Local Storage folders (for thumbnails/fallback)
@@ -88,11 +140,20 @@ os.makedirs(THUMB_DIR, exist_ok=True)
 # Static files
 app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 
+# Thumbnails are generated from local uploads (or bundled frontend images) on first request
+thumbnails = ThumbnailCache(THUMB_DIR, [UPLOAD_DIR, os.getenv("CLIENT_BUILD_PATH", "dist")])
+
 @app.on_event("startup")
 async def startup():
     # Create tables if they don't exist
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(ensure_indexes)
+        await search_index.setup(conn)
+
+    async with AsyncSession(engine) as session:
+        await table_versions.ensure(session)
+        await session.commit()
     
     # Seed default pillars and admin if needed
     async with AsyncSession(engine) as session:
@@ -113,81 +174,335 @@ async def startup():
         result = await session.execute(select(models.AdminUser).where(models.AdminUser.email == "admin"))
         user = result.scalar_one_or_none()
         if not user:
-            admin = models.AdminUser(email="admin", password_hash="Aakritii@2025", role="admin")
+            admin = models.AdminUser(email="admin", password_hash=await hash_password("Aakritii@2025"), role="admin")
             session.add(admin)
             print("Default Admin User Created (admin/Aakritii@2025)")
             
         await session.commit()
 
+    asset_reaper.start()
+    if volunteer_writer is not None:
+        volunteer_writer.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    if volunteer_writer is not None:
+        # Before anything else goes away: queued sign-ups still need the DB
+        await volunteer_writer.stop()
+    await asset_reaper.stop()
+    image_pool.shutdown()
+    upload_service.close()
+
+
+# Keyset orderings for the paginated list endpoints (?limit=&cursor=).
+# Each ends with the primary key so the order is total.
+FOLDERS_KEYSET = Keyset(models.GalleryFolder.created_at, models.GalleryFolder.id)
+IMAGES_KEYSET = Keyset(models.GalleryImage.created_at, models.GalleryImage.id)
+PILLARS_KEYSET = Keyset(models.Pillar.id, descending=False)
+PRESS_RELEASES_KEYSET = Keyset(models.PressRelease.date, models.PressRelease.id)
+CLIENTELE_KEYSET = Keyset(models.Clientele.id, descending=False)
+ACTIVITIES_KEYSET = Keyset(models.Activity.date, models.Activity.id)
+CSR_CONNECTS_KEYSET = Keyset(models.CSRConnect.id, descending=False)
+VOLUNTEERS_KEYSET = Keyset(models.Volunteer.submitted_at, models.Volunteer.id)
+
+# Columns read by the list endpoints: just the fields of each response schema,
+# fetched as plain rows and encoded directly (see serialization.py)
+FOLDER_COLUMNS = schema_columns(models.GalleryFolder, schemas.GalleryFolder)
+IMAGE_COLUMNS = schema_columns(models.GalleryImage, schemas.GalleryImage)
+# Content lists can be narrowed with ?fields=a,b (or widened with ?fields=*).
+# By default they leave out the long text columns the listing cards don't
+# show; GET /api/<resource>/{id} returns the full record.
+PILLAR_FIELDS = FieldSet(models.Pillar, schemas.Pillar)
+PRESS_RELEASE_FIELDS = FieldSet(models.PressRelease, schemas.PressRelease,
+                                default=("title", "date", "image_url", "created_at"), always=("date", "id"))
+CLIENTELE_FIELDS = FieldSet(models.Clientele, schemas.Clientele)
+ACTIVITY_FIELDS = FieldSet(models.Activity, schemas.Activity,
+                           default=("title", "date", "location", "image_url"), always=("date", "id"))
+CSR_CONNECT_FIELDS = FieldSet(models.CSRConnect, schemas.CSRConnect,
+                              default=("company_name", "logo_url", "website_url"))
+VOLUNTEER_COLUMNS = schema_columns(models.Volunteer, schemas.Volunteer)
+
+# Public content that is read on every page view but only changes when an
+# admin edits it is served from an in-process cache of serialized responses.
+# Write handlers invalidate by table name after committing.
+response_cache = ResponseCache()
+
+# Deletes Cloudinary assets queued by the delete/replace handlers below
+asset_reaper = AssetReaper(AsyncSessionLocal, on_change=response_cache.invalidate)
+upload_index = UploadIndex(ReadSessionLocal)
+
+# Opt-in: volunteer sign-ups are batched into multi-row inserts (see groupcommit.py)
+volunteer_writer = None
+if VOLUNTEER_WRITE_BEHIND in ("ack", "commit"):
+    volunteer_writer = GroupCommitWriter(
+        AsyncSessionLocal, models.Volunteer, on_commit=response_cache.invalidate,
+        wait_for_commit=VOLUNTEER_WRITE_BEHIND == "commit", timestamp_column="submitted_at",
+    )
+async def list_response(request: Request, db: AsyncSession, tables, load,
+                        cache: bool = False, public: bool = True) -> Response:
+    """Serve a list endpoint with an ETag derived from the tables' versions.
+
+    ``load`` is only awaited (rows fetched and serialized) when the client's
+    If-None-Match doesn't already match; it returns (row mappings, next_cursor).
+    """
+    async def build():
+        items, next_cursor = await load()
+        return rows_to_json(items), {NEXT_CURSOR_HEADER: next_cursor}
+
+    return await json_response(request, db, tables, build, cache=cache, public=public)
+
+async def detail_response(request: Request, db: AsyncSession, model, field_set: FieldSet, obj_id: int,
+                          fields: Optional[str], table: str, not_found: str) -> Response:
+    """One row by id, as a cached JSON object with the same ETags as the lists."""
+    async def build():
+        result = await db.execute(select(*field_set.select(fields)).where(model.id == obj_id))
+        row = result.mappings().first()
+        if row is None:
+            raise HTTPException(status_code=404, detail=not_found)
+        return dumps(dict(row)), {}
+
+    return await json_response(request, db, [table], build, cache=True)
+
+async def json_response(request: Request, db: AsyncSession, tables, build,
+                        cache: bool = False, public: bool = True) -> Response:
+    """ETag/304 and response-cache handling for any JSON body built from ``tables``.
+
+    ``build`` returns (body bytes, extra headers) and is only awaited on a miss.
+    """
+    cache_control = "public, no-cache" if public else "private, no-cache"
+    versions = await table_versions.current(db, *tables)
+    if cache:
+        # Only an entry built at the current versions: another worker may have written since
+        cached = response_cache.get(request, versions)
+        if cached is not None:
+            if etag_matches(request, cached.headers.get("etag")):
+                return Response(status_code=304, headers={"ETag": cached.headers["etag"], "Cache-Control": cache_control})
+            return cached
+
+    etag = make_etag(request, versions)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+    generation = response_cache.generation(tables)
+    body, extra_headers = await build()
+    headers = {"ETag": etag, "Cache-Control": cache_control, **extra_headers}
+    # Don't let a replica that hasn't caught up with a write we just made
+    # refill the cache with the old rows
+    if cache and reads_from_replica(db) and response_cache.changed_within(tables, DB_READ_STICKY_SECONDS):
+        cache = False
+    if cache:
+        return response_cache.put(request, body, tables, headers, versions=versions, generation=generation)
+    return Response(body, media_type="application/json", headers={k: v for k, v in headers.items() if v})
+
+async def commit_changes(db: AsyncSession, *tables: str):
+    # Version bump rides in the same transaction as the change; cached
+    # responses built from these tables are dropped once it's committed
+    await table_versions.bump(db, *tables)
+    await db.commit()
+    table_versions.invalidate()
+    response_cache.invalidate(*tables)
+
+async def delete_ids(db: AsyncSession, model, ids) -> List[int]:
+    """DELETE ... WHERE id IN (ids) as one statement; returns the ids removed."""
+    ids = list(dict.fromkeys(ids))
+    if db.bind.dialect.delete_returning:
+        result = await db.execute(delete(model).where(model.id.in_(ids)).returning(model.id))
+        return sorted(result.scalars().all())
+    # No DELETE ... RETURNING on MySQL: lock the matching rows first so the
+    # reported ids are exactly the ones the DELETE removes
+    result = await db.execute(select(model.id).where(model.id.in_(ids)).with_for_update())
+    found = sorted(result.scalars().all())
+    if found:
+        await db.execute(delete(model).where(model.id.in_(found)))
+    return found
+
+async def batch_delete(db: AsyncSession, model, ids, *tables: str, asset_column=None) -> dict:
+    if asset_column is not None:
+        result = await db.execute(select(asset_column).where(model.id.in_(ids)))
+        await asset_reaper.queue(db, *result.scalars().all())
+    deleted = await delete_ids(db, model, ids)
+    if deleted:
+        await commit_changes(db, *tables)
+    return {"deleted": deleted, "missing": sorted(set(ids) - set(deleted))}
+
+async def delete_folder_images(db: AsyncSession, folder_ids):
+    # The folders' images go in the same transaction (SQLite doesn't enforce
+    # the ON DELETE CASCADE unless foreign keys are switched on)
+    Image = models.GalleryImage
+    result = await db.execute(select(Image.image_url).where(Image.folder_id.in_(folder_ids)))
+    await asset_reaper.queue(db, *result.scalars().all())
+    await db.execute(delete(Image).where(Image.folder_id.in_(folder_ids)))
+
+async def replace_upload(db: AsyncSession, file: UploadFile, replaced: Optional[str]) -> str:
+    """Upload ``file`` to replace the asset at ``replaced``; returns the new URL.
+
+    Ends the session's transaction first so the pooled connection (the only
+    writer, on SQLite) isn't held through the upload. That expires loaded
+    rows: assign the other changed fields after this returns.
+    """
+    await db.rollback()
+    url = await store_upload(file, db)
+    await asset_reaper.queue(db, replaced)
+    return url
 
 # --- Auth ---
+# Admin routes take a signed bearer token from /api/auth/login. It is checked
+# in memory; only the revocation epochs are read from the DB (cached), through
+# the read pool so auth never queues behind the writer. With a replica, a
+# revocation also waits for replication before other workers see it.
+auth_epochs = AuthEpochs(ReadSessionLocal)
+require_admin = AdminAuth(auth_epochs)
+ADMIN_ONLY = [Depends(require_admin)]
+
+async def release_for_bcrypt(db: AsyncSession, user: Optional[models.AdminUser]):
+    # bcrypt takes ~0.2s per attempt and anyone can send logins: give the
+    # pooled connection back first, keeping the user row readable. Writes
+    # afterwards go through a short writer session of their own.
+    if user is not None:
+        db.expunge(user)
+    await db.rollback()
+
 @app.post("/api/auth/login", response_model=dict)
-async def login(request: schemas.LoginRequest, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(models.AdminUser).where(
-            models.AdminUser.email == request.email,
-            models.AdminUser.password_hash == request.password
-        )
-    )
+async def login(request: schemas.LoginRequest, db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(select(models.AdminUser).where(models.AdminUser.email == request.email))
     user = result.scalar_one_or_none()
-    if user:
-        return {"user": {"email": user.email, "id": user.id, "role": user.role}}
-    raise HTTPException(status_code=401, detail="Invalid Credentials")
+    epoch = await auth_epochs.load(db, user.id) if user else 0
+    await release_for_bcrypt(db, user)
+    ok, new_hash = await verify_password(request.password, user.password_hash if user else None)
+    if not user or not ok:
+        raise HTTPException(status_code=401, detail="Invalid Credentials")
+    if new_hash:
+        # Plaintext (or outdated) password from before hashing: upgrade it now
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(models.AdminUser).where(models.AdminUser.id == user.id).values(password_hash=new_hash)
+            )
+            await session.commit()
+    token = create_access_token(user, epoch)
+    return {
+        "user": {"email": user.email, "id": user.id, "role": user.role},
+        "access_token": token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_MINUTES * 60,
+    }
+
+@app.post("/api/auth/logout")
+async def logout(claims: dict = Depends(require_admin), db: AsyncSession = Depends(get_db)):
+    # Revokes every token of this user, on all devices
+    await auth_epochs.bump(db, int(claims["sub"]))
+    await db.commit()
+    return {"message": "Logged out"}
+
+@app.post("/api/auth/password")
+async def change_password(change: schemas.PasswordChange, claims: dict = Depends(require_admin),
+                          db: AsyncSession = Depends(get_read_db)):
+    user = await db.get(models.AdminUser, int(claims["sub"]))
+    await release_for_bcrypt(db, user)
+    ok, _ = await verify_password(change.current_password, user.password_hash if user else None)
+    if not user or not ok:
+        raise HTTPException(status_code=401, detail="Invalid Credentials")
+    password_hash = await hash_password(change.new_password)
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(models.AdminUser).where(models.AdminUser.id == user.id).values(password_hash=password_hash)
+        )
+        await auth_epochs.bump(session, user.id)
+        await session.commit()
+    return {"message": "Password changed. Please log in again."}
 
 # --- Gallery ---
 @app.get("/api/folders", response_model=List[schemas.GalleryFolder])
-async def get_folders(db: AsyncSession = Depends(get_db)):
-    # Original SQL: SELECT f.*, (SELECT image_url FROM gallery_images WHERE folder_id = f.id ORDER BY created_at ASC LIMIT 1) as cover_image FROM gallery_folders f ORDER BY f.created_at DESC
-    # We'll use a slightly different approach for the cover image in ORM if needed, 
-    # or just execute a raw query or subquery.
-    
-    result = await db.execute(select(models.GalleryFolder).order_by(models.GalleryFolder.created_at.desc()))
-    folders = result.scalars().all()
-    
-    # Enrich with cover image
-    response = []
-    for f in folders:
-        img_result = await db.execute(
-            select(models.GalleryImage.image_url)
-            .where(models.GalleryImage.folder_id == f.id)
-            .order_by(models.GalleryImage.created_at.asc())
-            .limit(1)
-        )
-        cover_image = img_result.scalar_one_or_none()
-        
-        folder_data = schemas.GalleryFolder.model_validate(f)
-        folder_data.cover_image = cover_image
-        response.append(folder_data)
-        
-    return response
+async def get_folders(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    # One round trip: the cover image, image count and latest upload are
+    # correlated subqueries, each answered from ix_gallery_images_folder_created
+    Folder, Image = models.GalleryFolder, models.GalleryImage
+    in_folder = Image.folder_id == Folder.id
+    cover_image = (
+        select(Image.image_url)
+        .where(in_folder)
+        .order_by(Image.created_at.asc(), Image.id.asc())
+        .limit(1)
+        .correlate(Folder)
+        .scalar_subquery()
+    )
+    image_count = select(func.count()).where(in_folder).correlate(Folder).scalar_subquery()
+    latest_upload = select(func.max(Image.created_at)).where(in_folder).correlate(Folder).scalar_subquery()
 
-@app.post("/api/folders", response_model=schemas.GalleryFolder)
+    limit = page_limit(limit)
+    query = select(
+        *FOLDER_COLUMNS,
+        cover_image.label("cover_image"),
+        image_count.label("image_count"),
+        latest_upload.label("latest_upload"),
+    )
+
+    async def load():
+        result = await db.execute(FOLDERS_KEYSET.apply(query, cursor, limit))
+        return FOLDERS_KEYSET.split(result.mappings().all(), limit)
+
+    return await list_response(request, db, ["gallery_folders", "gallery_images"], load)
+
+@app.post("/api/folders", response_model=schemas.GalleryFolder, dependencies=ADMIN_ONLY)
 async def create_folder(folder: schemas.GalleryFolderCreate, db: AsyncSession = Depends(get_db)):
     new_folder = models.GalleryFolder(**folder.model_dump())
     db.add(new_folder)
-    await db.commit()
+    await commit_changes(db, "gallery_folders")
     await db.refresh(new_folder)
     return new_folder
 
-@app.delete("/api/folders/{folder_id}")
+@app.delete("/api/folders/{folder_id}", dependencies=ADMIN_ONLY)
 async def delete_folder(folder_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.GalleryFolder).where(models.GalleryFolder.id == folder_id))
     folder = result.scalar_one_or_none()
     if not folder:
         raise HTTPException(status_code=404, detail="Folder not found")
+    await delete_folder_images(db, [folder_id])
     await db.delete(folder)
-    await db.commit()
+    await commit_changes(db, "gallery_folders", "gallery_images")
     return {"message": "Deleted"}
 
+@app.post("/api/folders:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_folders_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    # Images first, as in delete_folder: on MySQL the folder DELETE cascades
+    # to their rows, and their assets could no longer be queued afterwards
+    await delete_folder_images(db, batch.ids)
+    deleted = await delete_ids(db, models.GalleryFolder, batch.ids)
+    if deleted:
+        await commit_changes(db, "gallery_folders", "gallery_images")
+    return {"deleted": deleted, "missing": sorted(set(batch.ids) - set(deleted))}
+
 @app.get("/api/images", response_model=List[schemas.GalleryImage])
-async def get_images(folderId: Optional[int] = None, db: AsyncSession = Depends(get_db)):
-    query = select(models.GalleryImage).order_by(models.GalleryImage.created_at.desc())
+async def get_images(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    folderId: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    limit = page_limit(limit)
+    query = select(*IMAGE_COLUMNS)
+    if folderId:
+        query = query.where(models.GalleryImage.folder_id == folderId)
+
+    async def load():
+        result = await db.execute(IMAGES_KEYSET.apply(query, cursor, limit))
+        return IMAGES_KEYSET.split(result.mappings().all(), limit)
+
+    return await list_response(request, db, ["gallery_images"], load)
+
+@app.get("/api/images/export", dependencies=ADMIN_ONLY)
+async def export_images(format: str = Query("csv", pattern="^(csv|ndjson)$"), folderId: Optional[int] = None):
+    query = select(*IMAGE_COLUMNS).order_by(models.GalleryImage.id)
     if folderId:
         query = query.where(models.GalleryImage.folder_id == folderId)
-    result = await db.execute(query)
-    return result.scalars().all()
+    return export_response(ReadSessionLocal, query, format, "gallery-images")
 
-@app.post("/api/images", response_model=schemas.GalleryImage)
+@app.post("/api/images", response_model=schemas.GalleryImage, dependencies=ADMIN_ONLY)
 async def upload_image(
     folderId: int = Form(...),
     description: str = Form(None),
@@ -196,12 +511,7 @@ async def upload_image(
 ):
     try:
         # Upload to Cloudinary
-        processed_file = await process_image(image)
-        upload_result = cloudinary.uploader.upload(
-            processed_file,
-            folder="aakrittii_uploads"
-        )
-        url = upload_result.get("secure_url")
+        url = await store_upload(image, db)
         
         new_image = models.GalleryImage(
             folder_id=folderId,
@@ -209,29 +519,148 @@ async def upload_image(
             description=description
         )
         db.add(new_image)
-        await db.commit()
+        await commit_changes(db, "gallery_images")
         await db.refresh(new_image)
         return new_image
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.delete("/api/images/{image_id}")
+# Several photos of one album are processed and uploaded at a time; all rows
+# are inserted in a single transaction once the uploads have finished
+BATCH_UPLOAD_CONCURRENCY = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", "4"))
+BATCH_UPLOAD_MAX_FILES = int(os.getenv("BATCH_UPLOAD_MAX_FILES", "50"))
+
+@app.post("/api/folders/{folder_id}/images:batch", response_model=schemas.GalleryImageBatchResult, dependencies=ADMIN_ONLY)
+async def upload_images_batch(
+    folder_id: int,
+    images: List[UploadFile] = File(...),
+    description: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_db),
+):
+    if len(images) > BATCH_UPLOAD_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_UPLOAD_MAX_FILES} files per request")
+    folder = await db.get(models.GalleryFolder, folder_id)
+    if not folder:
+        raise HTTPException(status_code=404, detail="Folder not found")
+    # Don't hold a pooled connection (the only one, on SQLite) while uploading
+    await db.rollback()
+
+    slots = asyncio.Semaphore(BATCH_UPLOAD_CONCURRENCY)
+
+    async def store(image: UploadFile):
+        # One failed file doesn't fail the batch; it's reported in its result
+        async with slots:
+            try:
+                return await store_upload(image, db), None
+            except HTTPException as e:
+                return None, e.detail
+            except Exception as e:
+                print(f"Batch upload of {image.filename} failed: {e}")
+                return None, str(e)
+
+    outcomes = await asyncio.gather(*(store(image) for image in images))
+
+    new_images = {}
+    for i, (image, (url, _)) in enumerate(zip(images, outcomes)):
+        if url:
+            new_images[i] = models.GalleryImage(
+                folder_id=folder_id,
+                image_url=url,
+                description=description or image.filename,
+            )
+    rows = {}
+    if new_images:
+        db.add_all(new_images.values())
+        await commit_changes(db, "gallery_images")
+        # Server defaults (created_at) in one query instead of a refresh per row
+        ids = [img.id for img in new_images.values()]
+        result = await db.execute(select(*IMAGE_COLUMNS).where(models.GalleryImage.id.in_(ids)))
+        rows = {row["id"]: dict(row) for row in result.mappings().all()}
+
+    results = []
+    for i, (image, (url, error)) in enumerate(zip(images, outcomes)):
+        if i in new_images:
+            results.append({"filename": image.filename, "ok": True, "image": rows[new_images[i].id]})
+        else:
+            results.append({"filename": image.filename, "ok": False, "error": error})
+    return {"uploaded": len(new_images), "failed": len(images) - len(new_images), "results": results}
+
+@app.delete("/api/images/{image_id}", dependencies=ADMIN_ONLY)
 async def delete_image(image_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.GalleryImage).where(models.GalleryImage.id == image_id))
     image = result.scalar_one_or_none()
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
+    await asset_reaper.queue(db, image.image_url)
     await db.delete(image)
-    await db.commit()
+    await commit_changes(db, "gallery_images")
     return {"message": "Deleted"}
 
+@app.post("/api/images:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_images_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    return await batch_delete(db, models.GalleryImage, batch.ids, "gallery_images",
+                              asset_column=models.GalleryImage.image_url)
+
+@app.post("/api/images:batchUpdate", response_model=schemas.BatchUpdateResult, dependencies=ADMIN_ONLY)
+async def update_images_batch(batch: schemas.GalleryImageBatchUpdate, db: AsyncSession = Depends(get_db)):
+    # Move images to another folder and/or set one description on all of them
+    values = batch.model_dump(include={"folder_id", "description"}, exclude_none=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    if "folder_id" in values and not await db.get(models.GalleryFolder, values["folder_id"]):
+        raise HTTPException(status_code=404, detail="Folder not found")
+    Image = models.GalleryImage
+    ids = list(dict.fromkeys(batch.ids))
+    result = await db.execute(select(Image.id).where(Image.id.in_(ids)).with_for_update())
+    found = sorted(result.scalars().all())
+    if found:
+        await db.execute(update(Image).where(Image.id.in_(found)).values(**values))
+        await commit_changes(db, "gallery_images")
+    return {"updated": found, "missing": sorted(set(ids) - set(found))}
+
+@app.get("/api/thumbnail/{filename}")
+async def get_thumbnail(filename: str, request: Request, w: Optional[int] = None):
+    width = thumbnails.pick_width(w)
+    # AVIF/WebP when the browser says it can decode them, JPEG otherwise
+    fmt = negotiate_format(request.headers.get("accept"))
+    try:
+        path = await run_in_threadpool(thumbnails.get, filename, width, fmt)
+    except Exception as e:
+        print(f"Thumbnail generation failed for {filename}: {e}")
+        path = None
+    if not path:
+        raise HTTPException(status_code=404, detail="Image not found")
+    # Thumbnail names are derived from unique upload names, so they never change in place
+    return FileResponse(path, media_type=MIME_TYPES[fmt], headers={
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Vary": "Accept",
+    })
+
 # --- Pillars ---
-@app.get("/api/pillars", response_model=List[schemas.Pillar])
-async def get_pillars(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Pillar))
-    return result.scalars().all()
+@app.get("/api/pillars", response_model=List[schemas.PillarSummary])
+async def get_pillars(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    limit = page_limit(limit)
+
+    async def load():
+        result = await db.execute(PILLARS_KEYSET.apply(select(*PILLAR_FIELDS.select(fields)), cursor, limit))
+        return PILLARS_KEYSET.split(result.mappings().all(), limit)
+
+    return await list_response(request, db, ["pillars"], load, cache=True)
 
-@app.post("/api/pillars", response_model=schemas.Pillar)
+@app.get("/api/pillars/{pillar_id}", response_model=schemas.Pillar)
+async def get_pillar(request: Request, pillar_id: int, fields: Optional[str] = Query("*"),
+                    db: AsyncSession = Depends(get_read_db)):
+    return await detail_response(request, db, models.Pillar, PILLAR_FIELDS, pillar_id, fields, "pillars", "Pillar not found")
+
+@app.post("/api/pillars", response_model=schemas.Pillar, dependencies=ADMIN_ONLY)
 async def create_pillar(
     title: str = Form(...),
     description: str = Form(...),
@@ -242,17 +671,15 @@ async def create_pillar(
 ):
     url = image_url or ""
     if image:
-        processed_file = await process_image(image)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        url = upload_result.get("secure_url")
+        url = await store_upload(image, db)
     
     new_pillar = models.Pillar(title=title, description=description, icon=icon, image_url=url)
     db.add(new_pillar)
-    await db.commit()
+    await commit_changes(db, "pillars")
     await db.refresh(new_pillar)
     return new_pillar
 
-@app.put("/api/pillars/{pillar_id}")
+@app.put("/api/pillars/{pillar_id}", dependencies=ADMIN_ONLY)
 async def update_pillar(
     pillar_id: int,
     title: str = Form(...),
@@ -266,34 +693,54 @@ async def update_pillar(
     if not pillar:
         raise HTTPException(status_code=404, detail="Pillar not found")
     
+    if image:
+        pillar.image_url = await replace_upload(db, image, pillar.image_url)
     pillar.title = title
     pillar.description = description
     pillar.icon = icon
-    if image:
-        processed_file = await process_image(image)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        pillar.image_url = upload_result.get("secure_url")
-        
-    await db.commit()
+
+    await commit_changes(db, "pillars")
     return {"message": "Updated"}
 
-@app.delete("/api/pillars/{pillar_id}")
+@app.delete("/api/pillars/{pillar_id}", dependencies=ADMIN_ONLY)
 async def delete_pillar(pillar_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.Pillar).where(models.Pillar.id == pillar_id))
     pillar = result.scalar_one_or_none()
     if not pillar:
         raise HTTPException(status_code=404, detail="Pillar not found")
+    await asset_reaper.queue(db, pillar.image_url)
     await db.delete(pillar)
-    await db.commit()
+    await commit_changes(db, "pillars")
     return {"message": "Deleted"}
 
+@app.post("/api/pillars:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_pillars_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    return await batch_delete(db, models.Pillar, batch.ids, "pillars",
+                              asset_column=models.Pillar.image_url)
+
 # --- Press Releases ---
-@app.get("/api/press-releases", response_model=List[schemas.PressRelease])
-async def get_press_releases(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.PressRelease).order_by(models.PressRelease.date.desc()))
-    return result.scalars().all()
+@app.get("/api/press-releases", response_model=List[schemas.PressReleaseSummary])
+async def get_press_releases(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    limit = page_limit(limit)
+
+    async def load():
+        result = await db.execute(PRESS_RELEASES_KEYSET.apply(select(*PRESS_RELEASE_FIELDS.select(fields)), cursor, limit))
+        return PRESS_RELEASES_KEYSET.split(result.mappings().all(), limit)
 
-@app.post("/api/press-releases", response_model=schemas.PressRelease)
+    return await list_response(request, db, ["press_releases"], load, cache=True)
+
+@app.get("/api/press-releases/{pr_id}", response_model=schemas.PressRelease)
+async def get_press_release(request: Request, pr_id: int, fields: Optional[str] = Query("*"),
+                           db: AsyncSession = Depends(get_read_db)):
+    return await detail_response(request, db, models.PressRelease, PRESS_RELEASE_FIELDS, pr_id, fields, "press_releases", "Press release not found")
+
+@app.post("/api/press-releases", response_model=schemas.PressRelease, dependencies=ADMIN_ONLY)
 async def create_press_release(
     title: str = Form(...),
     date: str = Form(...),
@@ -303,17 +750,15 @@ async def create_press_release(
 ):
     url = ""
     if image:
-        processed_file = await process_image(image)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        url = upload_result.get("secure_url")
+        url = await store_upload(image, db)
     
     new_pr = models.PressRelease(title=title, date=date, content=content, image_url=url)
     db.add(new_pr)
-    await db.commit()
+    await commit_changes(db, "press_releases")
     await db.refresh(new_pr)
     return new_pr
 
-@app.put("/api/press-releases/{pr_id}")
+@app.put("/api/press-releases/{pr_id}", dependencies=ADMIN_ONLY)
 async def update_press_release(
     pr_id: int,
     title: str = Form(...),
@@ -327,34 +772,54 @@ async def update_press_release(
     if not pr:
         raise HTTPException(status_code=404, detail="Press Release not found")
     
+    if image:
+        pr.image_url = await replace_upload(db, image, pr.image_url)
     pr.title = title
     pr.date = date
     pr.content = content
-    if image:
-        processed_file = await process_image(image)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        pr.image_url = upload_result.get("secure_url")
-        
-    await db.commit()
+
+    await commit_changes(db, "press_releases")
     return {"message": "Updated"}
 
-@app.delete("/api/press-releases/{pr_id}")
+@app.delete("/api/press-releases/{pr_id}", dependencies=ADMIN_ONLY)
 async def delete_press_release(pr_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.PressRelease).where(models.PressRelease.id == pr_id))
     pr = result.scalar_one_or_none()
     if not pr:
         raise HTTPException(status_code=404, detail="Press Release not found")
+    await asset_reaper.queue(db, pr.image_url)
     await db.delete(pr)
-    await db.commit()
+    await commit_changes(db, "press_releases")
     return {"message": "Deleted"}
 
+@app.post("/api/press-releases:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_press_releases_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    return await batch_delete(db, models.PressRelease, batch.ids, "press_releases",
+                              asset_column=models.PressRelease.image_url)
+
 # --- Clientele ---
-@app.get("/api/clientele", response_model=List[schemas.Clientele])
-async def get_clientele(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Clientele))
-    return result.scalars().all()
+@app.get("/api/clientele", response_model=List[schemas.ClienteleSummary])
+async def get_clientele(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    limit = page_limit(limit)
+
+    async def load():
+        result = await db.execute(CLIENTELE_KEYSET.apply(select(*CLIENTELE_FIELDS.select(fields)), cursor, limit))
+        return CLIENTELE_KEYSET.split(result.mappings().all(), limit)
+
+    return await list_response(request, db, ["clientele"], load, cache=True)
+
+@app.get("/api/clientele/{client_id}", response_model=schemas.Clientele)
+async def get_client(request: Request, client_id: int, fields: Optional[str] = Query("*"),
+                    db: AsyncSession = Depends(get_read_db)):
+    return await detail_response(request, db, models.Clientele, CLIENTELE_FIELDS, client_id, fields, "clientele", "Client not found")
 
-@app.post("/api/clientele", response_model=schemas.Clientele)
+@app.post("/api/clientele", response_model=schemas.Clientele, dependencies=ADMIN_ONLY)
 async def create_clientele(
     name: str = Form(...),
     description: Optional[str] = Form(None),
@@ -363,17 +828,15 @@ async def create_clientele(
 ):
     url = ""
     if logo:
-        processed_file = await process_image(logo)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        url = upload_result.get("secure_url")
+        url = await store_upload(logo, db)
     
     new_client = models.Clientele(name=name, description=description, logo_url=url)
     db.add(new_client)
-    await db.commit()
+    await commit_changes(db, "clientele")
     await db.refresh(new_client)
     return new_client
 
-@app.put("/api/clientele/{client_id}")
+@app.put("/api/clientele/{client_id}", dependencies=ADMIN_ONLY)
 async def update_clientele(
     client_id: int,
     name: str = Form(...),
@@ -386,33 +849,53 @@ async def update_clientele(
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     
+    if logo:
+        client.logo_url = await replace_upload(db, logo, client.logo_url)
     client.name = name
     client.description = description
-    if logo:
-        processed_file = await process_image(logo)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        client.logo_url = upload_result.get("secure_url")
-        
-    await db.commit()
+
+    await commit_changes(db, "clientele")
     return {"message": "Updated"}
 
-@app.delete("/api/clientele/{client_id}")
+@app.delete("/api/clientele/{client_id}", dependencies=ADMIN_ONLY)
 async def delete_clientele(client_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.Clientele).where(models.Clientele.id == client_id))
     client = result.scalar_one_or_none()
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
+    await asset_reaper.queue(db, client.logo_url)
     await db.delete(client)
-    await db.commit()
+    await commit_changes(db, "clientele")
     return {"message": "Deleted"}
 
+@app.post("/api/clientele:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_clientele_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    return await batch_delete(db, models.Clientele, batch.ids, "clientele",
+                              asset_column=models.Clientele.logo_url)
+
 # --- Activities ---
-@app.get("/api/activities", response_model=List[schemas.Activity])
-async def get_activities(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Activity).order_by(models.Activity.date.desc()))
-    return result.scalars().all()
+@app.get("/api/activities", response_model=List[schemas.ActivitySummary])
+async def get_activities(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    limit = page_limit(limit)
+
+    async def load():
+        result = await db.execute(ACTIVITIES_KEYSET.apply(select(*ACTIVITY_FIELDS.select(fields)), cursor, limit))
+        return ACTIVITIES_KEYSET.split(result.mappings().all(), limit)
+
+    return await list_response(request, db, ["activities"], load, cache=True)
 
-@app.post("/api/activities", response_model=schemas.Activity)
+@app.get("/api/activities/{activity_id}", response_model=schemas.Activity)
+async def get_activity(request: Request, activity_id: int, fields: Optional[str] = Query("*"),
+                      db: AsyncSession = Depends(get_read_db)):
+    return await detail_response(request, db, models.Activity, ACTIVITY_FIELDS, activity_id, fields, "activities", "Activity not found")
+
+@app.post("/api/activities", response_model=schemas.Activity, dependencies=ADMIN_ONLY)
 async def create_activity(
     title: str = Form(...),
     date: str = Form(...),
@@ -423,17 +906,15 @@ async def create_activity(
 ):
     url = ""
     if image:
-        processed_file = await process_image(image)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        url = upload_result.get("secure_url")
+        url = await store_upload(image, db)
     
     new_activity = models.Activity(title=title, date=date, location=location, description=description, image_url=url)
     db.add(new_activity)
-    await db.commit()
+    await commit_changes(db, "activities")
     await db.refresh(new_activity)
     return new_activity
 
-@app.put("/api/activities/{activity_id}")
+@app.put("/api/activities/{activity_id}", dependencies=ADMIN_ONLY)
 async def update_activity(
     activity_id: int,
     title: str = Form(...),
@@ -448,35 +929,55 @@ async def update_activity(
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
     
+    if image:
+        activity.image_url = await replace_upload(db, image, activity.image_url)
     activity.title = title
     activity.date = date
     activity.location = location
     activity.description = description
-    if image:
-        processed_file = await process_image(image)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        activity.image_url = upload_result.get("secure_url")
-        
-    await db.commit()
+
+    await commit_changes(db, "activities")
     return {"message": "Updated"}
 
-@app.delete("/api/activities/{activity_id}")
+@app.delete("/api/activities/{activity_id}", dependencies=ADMIN_ONLY)
 async def delete_activity(activity_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.Activity).where(models.Activity.id == activity_id))
     activity = result.scalar_one_or_none()
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
+    await asset_reaper.queue(db, activity.image_url)
     await db.delete(activity)
-    await db.commit()
+    await commit_changes(db, "activities")
     return {"message": "Deleted"}
 
+@app.post("/api/activities:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_activities_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    return await batch_delete(db, models.Activity, batch.ids, "activities",
+                              asset_column=models.Activity.image_url)
+
 # --- CSR Connect ---
-@app.get("/api/csr-connects", response_model=List[schemas.CSRConnect])
-async def get_csr_connects(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.CSRConnect))
-    return result.scalars().all()
+@app.get("/api/csr-connects", response_model=List[schemas.CSRConnectSummary])
+async def get_csr_connects(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    limit = page_limit(limit)
+
+    async def load():
+        result = await db.execute(CSR_CONNECTS_KEYSET.apply(select(*CSR_CONNECT_FIELDS.select(fields)), cursor, limit))
+        return CSR_CONNECTS_KEYSET.split(result.mappings().all(), limit)
 
-@app.post("/api/csr-connects", response_model=schemas.CSRConnect)
+    return await list_response(request, db, ["csr_connects"], load, cache=True)
+
+@app.get("/api/csr-connects/{csr_id}", response_model=schemas.CSRConnect)
+async def get_csr_connect(request: Request, csr_id: int, fields: Optional[str] = Query("*"),
+                         db: AsyncSession = Depends(get_read_db)):
+    return await detail_response(request, db, models.CSRConnect, CSR_CONNECT_FIELDS, csr_id, fields, "csr_connects", "CSR connect not found")
+
+@app.post("/api/csr-connects", response_model=schemas.CSRConnect, dependencies=ADMIN_ONLY)
 async def create_csr_connect(
     company_name: str = Form(...),
     description: str = Form(...),
@@ -486,17 +987,15 @@ async def create_csr_connect(
 ):
     url = ""
     if logo:
-        processed_file = await process_image(logo)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        url = upload_result.get("secure_url")
+        url = await store_upload(logo, db)
     
     new_csr = models.CSRConnect(company_name=company_name, description=description, website_url=website_url, logo_url=url)
     db.add(new_csr)
-    await db.commit()
+    await commit_changes(db, "csr_connects")
     await db.refresh(new_csr)
     return new_csr
 
-@app.put("/api/csr-connects/{csr_id}")
+@app.put("/api/csr-connects/{csr_id}", dependencies=ADMIN_ONLY)
 async def update_csr_connect(
     csr_id: int,
     company_name: str = Form(...),
@@ -510,67 +1009,200 @@ async def update_csr_connect(
     if not csr:
         raise HTTPException(status_code=404, detail="CSR Connect not found")
     
+    if logo:
+        csr.logo_url = await replace_upload(db, logo, csr.logo_url)
     csr.company_name = company_name
     csr.description = description
     csr.website_url = website_url
-    if logo:
-        processed_file = await process_image(logo)
-        upload_result = cloudinary.uploader.upload(processed_file, folder="aakrittii_uploads")
-        csr.logo_url = upload_result.get("secure_url")
-        
-    await db.commit()
+
+    await commit_changes(db, "csr_connects")
     return {"message": "Updated"}
 
-@app.delete("/api/csr-connects/{csr_id}")
+@app.delete("/api/csr-connects/{csr_id}", dependencies=ADMIN_ONLY)
 async def delete_csr_connect(csr_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.CSRConnect).where(models.CSRConnect.id == csr_id))
     csr = result.scalar_one_or_none()
     if not csr:
         raise HTTPException(status_code=404, detail="CSR Connect not found")
+    await asset_reaper.queue(db, csr.logo_url)
     await db.delete(csr)
-    await db.commit()
+    await commit_changes(db, "csr_connects")
     return {"message": "Deleted"}
 
+@app.post("/api/csr-connects:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_csr_connects_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    return await batch_delete(db, models.CSRConnect, batch.ids, "csr_connects",
+                              asset_column=models.CSRConnect.logo_url)
+
 # --- Volunteers ---
-@app.get("/api/volunteers", response_model=List[schemas.Volunteer])
-async def get_volunteers(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Volunteer).order_by(models.Volunteer.submitted_at.desc()))
-    return result.scalars().all()
+@app.get("/api/volunteers", response_model=List[schemas.Volunteer], dependencies=ADMIN_ONLY)
+async def get_volunteers(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    limit = page_limit(limit)
+
+    async def load():
+        result = await db.execute(VOLUNTEERS_KEYSET.apply(select(*VOLUNTEER_COLUMNS), cursor, limit))
+        return VOLUNTEERS_KEYSET.split(result.mappings().all(), limit)
+
+    return await list_response(request, db, ["volunteers"], load, public=False)
+
+@app.get("/api/volunteers/export", dependencies=ADMIN_ONLY)
+async def export_volunteers(format: str = Query("csv", pattern="^(csv|ndjson)$")):
+    # Streamed straight from a server-side cursor; see export.py
+    query = select(*VOLUNTEER_COLUMNS).order_by(models.Volunteer.id)
+    return export_response(ReadSessionLocal, query, format, "volunteers")
 
 @app.post("/api/volunteers")
 async def create_volunteer(volunteer: schemas.VolunteerCreate, db: AsyncSession = Depends(get_db)):
+    if volunteer_writer is not None:
+        try:
+            await volunteer_writer.submit(volunteer.model_dump())
+        except WriterBusy as e:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many submissions right now, please retry shortly",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        return {"message": "Application Submitted"}
     new_v = models.Volunteer(**volunteer.model_dump())
     db.add(new_v)
-    await db.commit()
+    await commit_changes(db, "volunteers")
     return {"message": "Application Submitted"}
 
-@app.delete("/api/volunteers/{v_id}")
+@app.delete("/api/volunteers/{v_id}", dependencies=ADMIN_ONLY)
 async def delete_volunteer(v_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(models.Volunteer).where(models.Volunteer.id == v_id))
     v = result.scalar_one_or_none()
     if not v:
         raise HTTPException(status_code=404, detail="Volunteer not found")
     await db.delete(v)
-    await db.commit()
+    await commit_changes(db, "volunteers")
     return {"message": "Deleted"}
 
+@app.post("/api/volunteers:batchDelete", response_model=schemas.BatchDeleteResult, dependencies=ADMIN_ONLY)
+async def delete_volunteers_batch(batch: schemas.BatchIds, db: AsyncSession = Depends(get_db)):
+    return await batch_delete(db, models.Volunteer, batch.ids, "volunteers")
+
+# --- Home ---
+# The landing page's sections in one response, read one after another on the
+# request's session so a cold build holds a single pooled connection (running
+# them concurrently made simultaneous cold requests starve the read pool).
+# "next" holds the cursor of any section that was cut off at
+# HOME_SECTION_LIMIT (continue with ?cursor= on its list endpoint).
+# Sections carry every field (?fields=*): the landing page renders the
+# descriptions and press release text the lists leave out by default.
+HOME_SECTION_LIMIT = int(os.getenv("HOME_SECTION_LIMIT", "20"))
+HOME_SECTIONS = {
+    "pillars": (PILLARS_KEYSET, PILLAR_FIELDS.select("*"), "pillars"),
+    "activities": (ACTIVITIES_KEYSET, ACTIVITY_FIELDS.select("*"), "activities"),
+    "clientele": (CLIENTELE_KEYSET, CLIENTELE_FIELDS.select("*"), "clientele"),
+    "csr_connects": (CSR_CONNECTS_KEYSET, CSR_CONNECT_FIELDS.select("*"), "csr_connects"),
+    "press_releases": (PRESS_RELEASES_KEYSET, PRESS_RELEASE_FIELDS.select("*"), "press_releases"),
+}
+
+@app.get("/api/home")
+async def get_home(request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def build():
+        home, next_cursors = {}, {}
+        for name, (keyset, columns, _) in HOME_SECTIONS.items():
+            result = await db.execute(keyset.apply(select(*columns), None, HOME_SECTION_LIMIT))
+            items, cursor = keyset.split(result.mappings().all(), HOME_SECTION_LIMIT)
+            home[name] = [dict(row) for row in items]
+            if cursor:
+                next_cursors[name] = cursor
+        home["next"] = next_cursors
+        return dumps(home), {}
+
+    tables = [table for _, _, table in HOME_SECTIONS.values()]
+    return await json_response(request, db, tables, build, cache=True)
+
+# --- Search ---
+@app.get("/api/search")
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    # ?type=press_release,activity,image narrows the sources searched
+    kinds = [k for k in type.split(",") if k in SEARCH_KINDS] if type else list(SEARCH_KINDS)
+    if not kinds:
+        raise HTTPException(status_code=400, detail=f"type must be one of {', '.join(SEARCH_KINDS)}")
+    terms = search_terms(q)
+    limit = limit or SEARCH_PAGE_SIZE
+    after = decode_cursor(cursor, ((int, float), int)) if cursor else None
+
+    async def load():
+        if not terms:
+            return [], None
+        result = await db.execute(search_index.query(terms, kinds, after, limit))
+        rows = result.mappings().all()
+        next_cursor = encode_cursor((rows[limit - 1]["score"], rows[limit - 1]["rowid"])) if len(rows) > limit else None
+        return [search_index.to_item(row, terms) for row in rows[:limit]], next_cursor
+
+    return await list_response(request, db, SEARCH_TABLES, load)
+
+# --- Internal metrics ---
+@app.get("/api/_internal/cache", dependencies=ADMIN_ONLY)
+async def cache_stats():
+    return response_cache.stats()
+
+@app.get("/api/_internal/pool", dependencies=ADMIN_ONLY)
+async def db_pool_stats():
+    return pool_stats()
+
+@app.get("/api/_internal/uploads", dependencies=ADMIN_ONLY)
+async def upload_stats():
+    return {"dedup": upload_index.stats(), "cloudinary": upload_service.stats(), "images": image_pool.stats()}
+
+@app.get("/api/_internal/admission", dependencies=ADMIN_ONLY)
+async def admission_stats():
+    return admission.stats()
+
+@app.get("/api/_internal/writes", dependencies=ADMIN_ONLY)
+async def write_stats():
+    return {"volunteers": volunteer_writer.stats() if volunteer_writer is not None else {"mode": "off"}}
+
+@app.get("/api/_internal/reaper", dependencies=ADMIN_ONLY)
+async def reaper_stats():
+    return {**asset_reaper.stats(), "pending": await asset_reaper.pending()}
+
 # Serve Frontend
 CLIENT_BUILD_PATH = os.getenv("CLIENT_BUILD_PATH", "dist")
 if os.path.exists(CLIENT_BUILD_PATH):
-    app.mount("/assets", StaticFiles(directory=os.path.join(CLIENT_BUILD_PATH, "assets")), name="assets")
-    
+    frontend = FrontendFiles(CLIENT_BUILD_PATH)
+    _precompress_task = None
+
+    @app.on_event("startup")
+    async def precompress_frontend():
+        # Runs in the background; files go out uncompressed until their .br/.gz is written
+        global _precompress_task
+        _precompress_task = asyncio.create_task(run_in_threadpool(frontend.precompress))
+
     @app.get("/{rest_of_path:path}")
-    async def serve_frontend(rest_of_path: str):
+    async def serve_frontend(request: Request, rest_of_path: str):
         # If the request is for an API or file that exists, let it through
         # Otherwise, serve index.html
         if rest_of_path.startswith("api/") or rest_of_path.startswith("uploads/"):
             raise HTTPException(status_code=404)
-        
-        index_file = os.path.join(CLIENT_BUILD_PATH, "index.html")
-        if os.path.exists(index_file):
-            from fastapi.responses import FileResponse
-            return FileResponse(index_file)
-        raise HTTPException(status_code=404)
+
+        path = frontend.resolve(rest_of_path) if rest_of_path else None
+        if path and path != frontend.index_path:
+            return frontend.file_response(request, path)
+        if rest_of_path.startswith("assets/"):
+            # A stale hashed asset must 404, not turn into HTML
+            raise HTTPException(status_code=404)
+
+        response = frontend.index_response(request)
+        if response is None:
+            raise HTTPException(status_code=404)
+        return response
 else:
     print(f"Warning: {CLIENT_BUILD_PATH} not found. Frontend will not be served.")
 
@@ -1,7 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.sqlite import DATETIME as SQLiteDateTime
 from sqlalchemy.sql import func
 from .database import Base
 
+# SQLite stores server_default CURRENT_TIMESTAMP as "YYYY-MM-DD HH:MM:SS" text.
+# Bind datetimes in the same format (no ".000000" suffix), otherwise range
+# comparisons such as keyset pagination compare mismatched strings.
+Timestamp = DateTime().with_variant(
+    SQLiteDateTime(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 class AdminUser(Base):
     __tablename__ = "admin_users"
     id = Column(Integer, primary_key=True, index=True)
@@ -11,27 +20,39 @@ class AdminUser(Base):
 
 class GalleryFolder(Base):
     __tablename__ = "gallery_folders"
+    __table_args__ = (
+        Index("ix_gallery_folders_created_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255))
     description = Column(Text)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
 class GalleryImage(Base):
     __tablename__ = "gallery_images"
+    __table_args__ = (
+        # Covers the per-folder cover image / count / latest upload lookups
+        Index("ix_gallery_images_folder_created", "folder_id", "created_at"),
+        # Keyset pagination order for the unfiltered image list
+        Index("ix_gallery_images_created_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     folder_id = Column(Integer, ForeignKey("gallery_folders.id", ondelete="CASCADE"))
     image_url = Column(Text)
     description = Column(Text)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
 class PressRelease(Base):
     __tablename__ = "press_releases"
+    __table_args__ = (
+        Index("ix_press_releases_date_id", "date", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255))
     date = Column(String(50))
     content = Column(Text)
     image_url = Column(Text)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
 class Clientele(Base):
     __tablename__ = "clientele"
@@ -42,6 +63,9 @@ class Clientele(Base):
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_date_id", "date", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255))
     date = Column(String(50))
@@ -59,12 +83,15 @@ class CSRConnect(Base):
 
 class Volunteer(Base):
     __tablename__ = "volunteers"
+    __table_args__ = (
+        Index("ix_volunteers_submitted_id", "submitted_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255))
     email = Column(String(255))
     phone = Column(String(50))
     message = Column(Text)
-    submitted_at = Column(DateTime, server_default=func.now())
+    submitted_at = Column(Timestamp, server_default=func.now())
 
 class Pillar(Base):
     __tablename__ = "pillars"
@@ -73,3 +100,45 @@ class Pillar(Base):
     description = Column(Text)
     image_url = Column(Text)
     icon = Column(String(50))
+
+class TableVersion(Base):
+    # Change counter per table, bumped in the same transaction as every write.
+    # List endpoints derive their ETags from it.
+    __tablename__ = "table_versions"
+    name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class CloudinaryAsset(Base):
+    # Every uploaded asset. queued_at is set when the row that used it is
+    # deleted or its image replaced; the reaper then removes it from Cloudinary.
+    __tablename__ = "cloudinary_assets"
+    __table_args__ = (
+        Index("ix_cloudinary_assets_queued", "queued_at"),
+    )
+    public_id = Column(String(255), primary_key=True)
+    url = Column(String(512), index=True)
+    created_at = Column(Timestamp, server_default=func.now())
+    queued_at = Column(Timestamp, nullable=True)
+
+class UploadFingerprint(Base):
+    # Content hashes of uploaded originals, pointing at the asset they became.
+    # phash is split into four 16-bit bands so near-duplicates (up to 3 bits
+    # apart) always share at least one indexed band.
+    __tablename__ = "upload_fingerprints"
+    id = Column(Integer, primary_key=True)
+    sha256 = Column(String(64), index=True)
+    phash = Column(BigInteger, nullable=True)
+    band0 = Column(Integer, index=True)
+    band1 = Column(Integer, index=True)
+    band2 = Column(Integer, index=True)
+    band3 = Column(Integer, index=True)
+    public_id = Column(String(255), index=True)
+    url = Column(String(512))
+    created_at = Column(Timestamp, server_default=func.now())
+
+class AuthEpoch(Base):
+    # Bumped to revoke every access token issued to the user before it
+    # (logout, password change). No row means epoch 0.
+    __tablename__ = "auth_epochs"
+    user_id = Column(Integer, ForeignKey("admin_users.id", ondelete="CASCADE"), primary_key=True)
+    epoch = Column(Integer, nullable=False, default=0)
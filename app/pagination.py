@@ -0,0 +1,92 @@
+import base64
+import json
+import os
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+PAGE_DEFAULT_LIMIT = int(os.getenv("PAGE_DEFAULT_LIMIT", "100"))
+PAGE_MAX_LIMIT = int(os.getenv("PAGE_MAX_LIMIT", "500"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_limit(limit: Optional[int]) -> int:
+    return max(1, min(limit or PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT))
+
+
+def encode_cursor(values) -> str:
+    # Datetimes aren't JSON - tag them so they round-trip
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types) -> list:
+    """Decode a cursor from encode_cursor(); ``types`` has each value's type(s).
+
+    A tampered cursor, or one issued by another endpoint, is a 400 rather
+    than a value of the wrong type bound to the query.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in payload]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(values) != len(types) or not all(_is_cursor_value(v, t) for v, t in zip(values, types)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _is_cursor_value(value, types) -> bool:
+    # None comes from NULL columns; bool is an int subclass but never a key
+    return value is None or (isinstance(value, types) and not isinstance(value, bool))
+
+
+class Keyset:
+    """Keyset (seek) pagination over an ordered tuple of columns.
+
+    The last column must be unique (the primary key) so the order is total.
+    Pages are fetched with ``WHERE (cols) < (last row's values)`` spelled out
+    as OR/AND so both SQLite and MySQL can use the matching composite index,
+    and the cost of a page doesn't depend on how deep into the table it is.
+    """
+
+    def __init__(self, *columns, descending: bool = True):
+        self.columns = columns
+        self.descending = descending
+        # What a cursor may hold: datetime, int or str, as the columns do
+        self.types = tuple(col.type.python_type for col in columns)
+
+    def _after(self, values):
+        clauses = []
+        for i, col in enumerate(self.columns):
+            beyond = col < values[i] if self.descending else col > values[i]
+            equal = [c == v for c, v in zip(self.columns[:i], values[:i])]
+            clauses.append(and_(*equal, beyond) if equal else beyond)
+        return or_(*clauses)
+
+    def apply(self, query, cursor: Optional[str], limit: int):
+        if cursor:
+            query = query.where(self._after(decode_cursor(cursor, self.types)))
+        order = [c.desc() if self.descending else c.asc() for c in self.columns]
+        # One extra row tells us whether there is a next page
+        return query.order_by(*order).limit(limit + 1)
+
+    def key(self, item) -> tuple:
+        # ORM objects, or row mappings from result.mappings()
+        if isinstance(item, Mapping):
+            return tuple(item[c.key] for c in self.columns)
+        return tuple(getattr(item, c.key) for c in self.columns)
+
+    def split(self, items, limit: int, key=None):
+        """Trim the extra row and return (page, next_cursor or None)."""
+        items = list(items)
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor((key or self.key)(items[-1]))
+
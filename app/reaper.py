@@ -0,0 +1,232 @@
+import asyncio
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import cloudinary
+from sqlalchemy import delete, func, select, union_all, update
+
+from . import models
+from .uploads import DELETE_BATCH_SIZE, UploadError, upload_service
+from .versions import table_versions
+
+# How often the reaper runs (0 disables it) and how long a queued asset is
+# left alone first, so a quick undo/re-save or a lagging replica never sees
+# an image disappear from under it
+ASSET_REAPER_INTERVAL = float(os.getenv("ASSET_REAPER_INTERVAL", "600"))
+ASSET_REAPER_GRACE = float(os.getenv("ASSET_REAPER_GRACE", "300"))
+ASSET_REAPER_MAX_PER_RUN = int(os.getenv("ASSET_REAPER_MAX_PER_RUN", "1000"))
+
+# Columns that hold Cloudinary URLs. An asset still referenced by any of them
+# is never deleted, even if it was queued.
+ASSET_REFERENCES = (
+    models.GalleryImage.image_url,
+    models.Pillar.image_url,
+    models.PressRelease.image_url,
+    models.Clientele.logo_url,
+    models.Activity.image_url,
+    models.CSRConnect.logo_url,
+)
+
+# .../image/upload/[transformations/]v123/<public_id>.<ext>
+_PUBLIC_ID = re.compile(r"/image/upload/(?:[^?#]*?/)?v\d+/([^?#]+?)(?:\.[A-Za-z0-9]+)?(?:[?#].*)?$")
+
+
+def public_id_from_url(url: str) -> Optional[str]:
+    match = _PUBLIC_ID.search(url or "")
+    return match.group(1) if match else None
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class AssetReaper:
+    """Deletes Cloudinary assets that no row points to any more.
+
+    Uploads are recorded in ``cloudinary_assets``; handlers that delete a row
+    or replace its image call ``queue()`` in the same transaction. Every
+    ``interval`` seconds the reaper takes the queued assets older than
+    ``grace``, drops the ones that are still referenced (the same URL can be
+    reused) and deletes the rest with one Admin API call per 100 assets. It
+    also removes gallery images whose folder no longer exists.
+    """
+
+    def __init__(self, session_factory, on_change: Optional[Callable] = None,
+                 interval: float = ASSET_REAPER_INTERVAL, grace: float = ASSET_REAPER_GRACE,
+                 max_per_run: int = ASSET_REAPER_MAX_PER_RUN):
+        self.session_factory = session_factory
+        self.on_change = on_change
+        self.interval = interval
+        self.grace = grace
+        self.max_per_run = max_per_run
+        self._task = None
+        self.runs = 0
+        self.purged = 0
+        self.not_found = 0
+        self.still_referenced = 0
+        self.failed = 0
+        self.orphan_images = 0
+        self.last_run = None
+        self.last_duration_ms = None
+        self.last_error = None
+
+    @staticmethod
+    def record(session, result: dict):
+        """Remember an upload; committed together with the row that uses it."""
+        if result.get("public_id"):
+            session.add(models.CloudinaryAsset(public_id=result["public_id"], url=result.get("secure_url")))
+
+    async def queue(self, session, *urls: Optional[str]):
+        """Mark the assets behind ``urls`` for deletion. Call before committing."""
+        urls = {u for u in urls if u}
+        if not urls:
+            return
+        Asset = models.CloudinaryAsset
+        now = _utcnow()
+        by_id = {public_id_from_url(u): u for u in urls}
+        by_id.pop(None, None)
+        result = await session.execute(
+            select(Asset.public_id, Asset.url).where(Asset.url.in_(urls) | Asset.public_id.in_(list(by_id)))
+        )
+        known = result.all()
+        if known:
+            await session.execute(
+                update(Asset).where(Asset.public_id.in_([r.public_id for r in known])).values(queued_at=now)
+            )
+        # Assets uploaded before they were recorded: queue them by URL
+        known_ids = {r.public_id for r in known}
+        known_urls = {r.url for r in known}
+        for public_id, url in by_id.items():
+            if public_id not in known_ids and url not in known_urls:
+                session.add(Asset(public_id=public_id, url=url, queued_at=now))
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Asset reaper run failed: {e}")
+
+    async def run_once(self) -> dict:
+        started = time.perf_counter()
+        self.runs += 1
+        self.last_run = _utcnow().isoformat()
+        await self._remove_orphan_images()
+        candidates = await self._claim_candidates()
+        purged = await self._purge(candidates)
+        self.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        return {"candidates": len(candidates), "purged": purged}
+
+    async def _remove_orphan_images(self):
+        Image, Folder = models.GalleryImage, models.GalleryFolder
+        async with self.session_factory() as session:
+            orphaned = Image.folder_id.is_not(None) & Image.folder_id.not_in(select(Folder.id))
+            result = await session.execute(select(Image.id, Image.image_url).where(orphaned))
+            rows = result.all()
+            if not rows:
+                return
+            await self.queue(session, *(r.image_url for r in rows))
+            await session.execute(delete(Image).where(Image.id.in_([r.id for r in rows])))
+            await table_versions.bump(session, "gallery_images")
+            await session.commit()
+        table_versions.invalidate()
+        self.orphan_images += len(rows)
+        if self.on_change:
+            self.on_change("gallery_images")
+
+    async def _claim_candidates(self) -> list:
+        Asset = models.CloudinaryAsset
+        cutoff = _utcnow() - timedelta(seconds=self.grace)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Asset.public_id, Asset.url)
+                .where(Asset.queued_at.is_not(None), Asset.queued_at <= cutoff)
+                .order_by(Asset.queued_at)
+                .limit(self.max_per_run)
+            )
+            queued = result.all()
+            if not queued:
+                return []
+            urls = [r.url for r in queued if r.url]
+            referenced = set()
+            if urls:
+                used = union_all(*(select(col.label("url")).where(col.in_(urls)) for col in ASSET_REFERENCES))
+                referenced = set((await session.execute(used)).scalars().all())
+            keep = [r.public_id for r in queued if r.url in referenced]
+            if keep:
+                # Re-used somewhere since it was queued: it's live again
+                await session.execute(update(Asset).where(Asset.public_id.in_(keep)).values(queued_at=None))
+                await session.commit()
+                self.still_referenced += len(keep)
+        return [r.public_id for r in queued if r.url not in referenced]
+
+    async def _purge(self, public_ids: list) -> int:
+        if not public_ids:
+            return 0
+        if not cloudinary.config().api_key:
+            self.last_error = "Cloudinary is not configured"
+            return 0
+        done = []
+        for i in range(0, len(public_ids), DELETE_BATCH_SIZE):
+            chunk = public_ids[i:i + DELETE_BATCH_SIZE]
+            try:
+                result = await upload_service.delete_resources(chunk)
+            except UploadError as e:
+                # Left queued; retried on the next run
+                self.failed += len(chunk)
+                self.last_error = str(e)
+                continue
+            statuses = result.get("deleted", {})
+            for public_id in chunk:
+                if statuses.get(public_id) == "not_found":
+                    self.not_found += 1
+                else:
+                    self.purged += 1
+                done.append(public_id)
+        if done:
+            async with self.session_factory() as session:
+                await session.execute(delete(models.CloudinaryAsset).where(models.CloudinaryAsset.public_id.in_(done)))
+                await session.execute(delete(models.UploadFingerprint).where(models.UploadFingerprint.public_id.in_(done)))
+                await session.commit()
+        return len(done)
+
+    async def pending(self) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(func.count()).where(models.CloudinaryAsset.queued_at.is_not(None))
+            )
+            return result.scalar()
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "grace": self.grace,
+            "runs": self.runs,
+            "purged": self.purged,
+            "not_found": self.not_found,
+            "still_referenced": self.still_referenced,
+            "failed": self.failed,
+            "orphan_images": self.orphan_images,
+            "last_run": self.last_run,
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error,
+        }
+
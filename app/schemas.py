@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -7,6 +7,10 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str = Field(min_length=8, max_length=72)
+
 class UserResponse(BaseModel):
     email: str
     id: int
@@ -24,6 +28,8 @@ class GalleryFolder(GalleryFolderBase):
     id: int
     created_at: datetime
     cover_image: Optional[str] = None
+    image_count: int = 0
+    latest_upload: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
 
@@ -41,6 +47,17 @@ class GalleryImage(GalleryImageBase):
 
     model_config = {"from_attributes": True}
 
+class GalleryImageUploadResult(BaseModel):
+    filename: Optional[str] = None
+    ok: bool
+    image: Optional[GalleryImage] = None
+    error: Optional[str] = None
+
+class GalleryImageBatchResult(BaseModel):
+    uploaded: int
+    failed: int
+    results: List[GalleryImageUploadResult]
+
 # Pillar
 class PillarBase(BaseModel):
     title: str
@@ -56,6 +73,14 @@ class Pillar(PillarBase):
 
     model_config = {"from_attributes": True}
 
+# List items: every field but the id can be left out with ?fields=
+class PillarSummary(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    icon: Optional[str] = None
+    image_url: Optional[str] = None
+
 # Press Release
 class PressReleaseBase(BaseModel):
     title: str
@@ -72,6 +97,15 @@ class PressRelease(PressReleaseBase):
 
     model_config = {"from_attributes": True}
 
+# List items leave out ``content`` unless it is asked for with ?fields=
+class PressReleaseSummary(BaseModel):
+    id: int
+    date: str
+    title: Optional[str] = None
+    content: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+
 # Clientele
 class ClienteleBase(BaseModel):
     name: str
@@ -86,6 +120,12 @@ class Clientele(ClienteleBase):
 
     model_config = {"from_attributes": True}
 
+class ClienteleSummary(BaseModel):
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    logo_url: Optional[str] = None
+
 # Activity
 class ActivityBase(BaseModel):
     title: str
@@ -102,6 +142,15 @@ class Activity(ActivityBase):
 
     model_config = {"from_attributes": True}
 
+# List items leave out ``description`` unless it is asked for with ?fields=
+class ActivitySummary(BaseModel):
+    id: int
+    date: str
+    title: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+
 # CSR Connect
 class CSRConnectBase(BaseModel):
     company_name: str
@@ -117,6 +166,14 @@ class CSRConnect(CSRConnectBase):
 
     model_config = {"from_attributes": True}
 
+# List items leave out ``description`` unless it is asked for with ?fields=
+class CSRConnectSummary(BaseModel):
+    id: int
+    company_name: Optional[str] = None
+    description: Optional[str] = None
+    website_url: Optional[str] = None
+    logo_url: Optional[str] = None
+
 # Volunteer
 class VolunteerBase(BaseModel):
     name: str
@@ -132,3 +189,19 @@ class Volunteer(VolunteerBase):
     submitted_at: datetime
 
     model_config = {"from_attributes": True}
+
+# Batch mutations
+class BatchIds(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+class BatchDeleteResult(BaseModel):
+    deleted: List[int]
+    missing: List[int]
+
+class GalleryImageBatchUpdate(BatchIds):
+    folder_id: Optional[int] = None
+    description: Optional[str] = None
+
+class BatchUpdateResult(BaseModel):
+    updated: List[int]
+    missing: List[int]
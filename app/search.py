@@ -0,0 +1,250 @@
+import html
+import os
+import re
+from typing import List, Optional
+
+from sqlalchemy import Integer, and_, func, literal, null, or_, select, text, union_all
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.exc import DBAPIError
+
+from . import models
+
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "20"))
+SEARCH_MAX_TERMS = 8
+SNIPPET_WORDS = 24
+FTS_TABLE = "search_index"
+# Placeholders for the highlight markers; the text is HTML-escaped before
+# they become <mark> tags
+_OPEN, _CLOSE = "\x02", "\x03"
+
+
+class Source:
+    """A searchable table: its title column and the text columns searched."""
+
+    def __init__(self, kind: str, code: int, model, title: Optional[str], body: List[str], folder: Optional[str] = None):
+        self.kind = kind
+        # rowid in the FTS table is id * 4 + code, so one index covers all sources
+        self.code = code
+        self.model = model
+        self.title = title
+        self.body = body
+        self.folder = folder
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    def column(self, name: Optional[str]):
+        return getattr(self.model, name) if name else null()
+
+    def body_expr(self):
+        cols = [func.coalesce(getattr(self.model, name), "") for name in self.body]
+        expr = cols[0]
+        for col in cols[1:]:
+            expr = expr.concat(" ").concat(col)
+        return expr
+
+
+SOURCES = (
+    Source("press_release", 1, models.PressRelease, "title", ["content"]),
+    Source("activity", 2, models.Activity, "title", ["description", "location"]),
+    Source("image", 3, models.GalleryImage, None, ["description"], folder="folder_id"),
+)
+SEARCH_KINDS = tuple(s.kind for s in SOURCES)
+SEARCH_TABLES = [s.table for s in SOURCES]
+
+
+def search_terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())[:SEARCH_MAX_TERMS]
+
+
+def _marked_html(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return html.escape(value).replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def _mark(value: str, terms: List[str]) -> str:
+    pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in terms) + r")\w*", re.IGNORECASE)
+    return pattern.sub(lambda m: _OPEN + m.group(0) + _CLOSE, value)
+
+
+def _snippet(value: Optional[str], terms: List[str]) -> Optional[str]:
+    # Same shape as FTS5's snippet(): ~SNIPPET_WORDS words around the first hit
+    if not value:
+        return value
+    words = value.split()
+    first = next((i for i, w in enumerate(words) if any(w.lower().lstrip("\"'(").startswith(t) for t in terms)), 0)
+    start = max(0, first - SNIPPET_WORDS // 4)
+    text_ = " ".join(words[start:start + SNIPPET_WORDS])
+    return ("…" if start else "") + _mark(text_, terms) + ("…" if start + SNIPPET_WORDS < len(words) else "")
+
+
+class SearchIndex:
+    """Full-text search over press releases, activities and gallery images.
+
+    SQLite: one FTS5 table kept in sync by triggers on the source tables,
+    ranked with bm25 (title weighted over body) and highlighted by FTS5.
+    MySQL: FULLTEXT indexes on the source tables, queried with MATCH ...
+    AGAINST in boolean mode. Where neither is available (SQLite without
+    FTS5, TiDB) it falls back to LIKE, which scans.
+
+    Every term is matched as a prefix, and all terms must match. Results are
+    ordered by score (higher is better) and paged with a (score, rowid)
+    cursor. Titles and snippets come back HTML-escaped with <mark> around
+    the matched terms.
+    """
+
+    def __init__(self):
+        self.mode = "like"
+
+    async def setup(self, conn):
+        """Create the index (on startup, inside the DDL transaction)."""
+        if conn.dialect.name == "sqlite":
+            await self._setup_sqlite(conn)
+        elif conn.dialect.name == "mysql":
+            await self._setup_mysql(conn)
+        print(f"Search index: {self.mode}")
+
+    async def _setup_sqlite(self, conn):
+        result = await conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        )
+        existed = result.first() is not None
+        try:
+            await conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "kind UNINDEXED, ref_id UNINDEXED, folder_id UNINDEXED, image_url UNINDEXED, title, body, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            )
+        except DBAPIError as e:
+            print(f"FTS5 not available, search falls back to LIKE: {e}")
+            return
+        for source in SOURCES:
+            for statement in self._sqlite_triggers(source):
+                await conn.exec_driver_sql(statement)
+        if not existed:
+            await self.rebuild(conn)
+        self.mode = "fts5"
+
+    @staticmethod
+    def _sqlite_row(source: Source, ref: str) -> str:
+        title = f"{ref}.{source.title}" if source.title else "NULL"
+        folder = f"{ref}.{source.folder}" if source.folder else "NULL"
+        body = " || ' ' || ".join(f"coalesce({ref}.{c}, '')" for c in source.body)
+        return f"{ref}.id * 4 + {source.code}, '{source.kind}', {ref}.id, {folder}, {ref}.image_url, {title}, {body}"
+
+    def _sqlite_triggers(self, source: Source) -> List[str]:
+        insert = f"INSERT INTO {FTS_TABLE} (rowid, kind, ref_id, folder_id, image_url, title, body) VALUES ({{}});"
+        remove = f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 4 + {source.code};"
+        prefix = f"CREATE TRIGGER IF NOT EXISTS {source.table}_search"
+        return [
+            f"{prefix}_ai AFTER INSERT ON {source.table} BEGIN {insert.format(self._sqlite_row(source, 'new'))} END",
+            f"{prefix}_ad AFTER DELETE ON {source.table} BEGIN {remove} END",
+            f"{prefix}_au AFTER UPDATE ON {source.table} BEGIN {remove} {insert.format(self._sqlite_row(source, 'new'))} END",
+        ]
+
+    async def rebuild(self, conn):
+        await conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+        for source in SOURCES:
+            await conn.exec_driver_sql(
+                f"INSERT INTO {FTS_TABLE} (rowid, kind, ref_id, folder_id, image_url, title, body) "
+                f"SELECT {self._sqlite_row(source, source.table)} FROM {source.table}"
+            )
+
+    async def _setup_mysql(self, conn):
+        try:
+            for source in SOURCES:
+                name = f"ft_{source.table}"
+                result = await conn.exec_driver_sql(
+                    "SELECT 1 FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+                    (source.table, name),
+                )
+                if result.first() is None:
+                    columns = ", ".join(([source.title] if source.title else []) + source.body)
+                    await conn.exec_driver_sql(f"CREATE FULLTEXT INDEX {name} ON {source.table} ({columns})")
+        except DBAPIError as e:
+            # e.g. TiDB, which has no FULLTEXT indexes
+            print(f"FULLTEXT indexes not available, search falls back to LIKE: {e}")
+            return
+        self.mode = "fulltext"
+
+    def query(self, terms: List[str], kinds, after: Optional[list], limit: int):
+        """SELECT for one page (plus one row) of hits for ``terms``."""
+        if self.mode == "fts5":
+            return self._fts5_query(terms, kinds, after, limit)
+        selects = [self._source_select(s, terms) for s in SOURCES if s.kind in kinds]
+        hits = union_all(*selects).subquery("hits")
+        query = select(hits)
+        if after:
+            query = query.where(or_(hits.c.score < after[0], and_(hits.c.score == after[0], hits.c.rowid > after[1])))
+        return query.order_by(hits.c.score.desc(), hits.c.rowid).limit(limit + 1)
+
+    def _fts5_query(self, terms, kinds, after, limit):
+        # Prefix match on every term; quoting keeps FTS5 syntax out of user input
+        match = " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+        where = ""
+        params = {"match": match, "limit": limit + 1}
+        if len(kinds) < len(SOURCES):
+            where += " AND kind IN ({})".format(", ".join(f":kind{i}" for i in range(len(kinds))))
+            params.update({f"kind{i}": kind for i, kind in enumerate(kinds)})
+        inner = (
+            f"SELECT kind, ref_id AS id, folder_id, image_url, "
+            f"highlight({FTS_TABLE}, 4, char(2), char(3)) AS title, "
+            f"snippet({FTS_TABLE}, 5, char(2), char(3), '…', {SNIPPET_WORDS}) AS body, "
+            f"-bm25({FTS_TABLE}, 0, 0, 0, 0, 5.0, 1.0) AS score, rowid "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match{where}"
+        )
+        outer = f"SELECT * FROM ({inner}) AS hits"
+        if after:
+            outer += " WHERE score < :score OR (score = :score AND rowid > :rowid)"
+            params.update({"score": after[0], "rowid": after[1]})
+        return text(f"{outer} ORDER BY score DESC, rowid LIMIT :limit").bindparams(**params)
+
+    def _source_select(self, source: Source, terms: List[str]):
+        M = source.model
+        title, body = source.column(source.title), source.body_expr()
+        if self.mode == "fulltext":
+            columns = ([getattr(M, source.title)] if source.title else []) + [getattr(M, c) for c in source.body]
+            score = mysql_match(*columns, against=" ".join(f"+{t}*" for t in terms)).in_boolean_mode()
+            where = score > 0
+        else:
+            matches = [
+                or_(*([getattr(M, source.title).ilike(f"%{t}%")] if source.title else []),
+                    *(getattr(M, c).ilike(f"%{t}%") for c in source.body))
+                for t in terms
+            ]
+            where = and_(*matches)
+            # Terms found in the title rank first
+            score = literal(0) if not source.title else sum(
+                getattr(M, source.title).ilike(f"%{t}%").cast(Integer) for t in terms
+            )
+        return select(
+            literal(source.kind).label("kind"),
+            M.id.label("id"),
+            source.column(source.folder).label("folder_id"),
+            M.image_url.label("image_url"),
+            title.label("title"),
+            body.label("body"),
+            score.label("score"),
+            (M.id * 4 + source.code).label("rowid"),
+        ).where(where)
+
+    def to_item(self, row, terms: List[str]) -> dict:
+        if self.mode == "fts5":
+            title, snippet = row["title"], row["body"]
+        else:
+            title = _mark(row["title"], terms) if row["title"] else row["title"]
+            snippet = _snippet(row["body"], terms)
+        return {
+            "type": row["kind"],
+            "id": row["id"],
+            "folder_id": row["folder_id"],
+            "image_url": row["image_url"],
+            "title": _marked_html(title),
+            "snippet": _marked_html(snippet),
+        }
+
+
+search_index = SearchIndex()
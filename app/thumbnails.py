@@ -0,0 +1,159 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from PIL import Image, ImageOps
+
+from .imaging import encode_image
+
+
+def _parse_widths(value: str) -> tuple:
+    widths = sorted({int(w) for w in value.split(",") if w.strip()})
+    return tuple(widths) or (480,)
+
+
+# Fixed widths we generate - arbitrary ?w= values snap to one of these so the
+# cache can't be filled with one variant per pixel width
+THUMB_WIDTHS = _parse_widths(os.getenv("THUMB_WIDTHS", "160,480,960"))
+DEFAULT_THUMB_WIDTH = int(os.getenv("THUMB_DEFAULT_WIDTH", "480"))
+THUMB_CACHE_MAX_BYTES = int(os.getenv("THUMB_CACHE_MAX_MB", "256")) * 1024 * 1024
+THUMB_QUALITY = int(os.getenv("THUMB_QUALITY", "80"))
+
+
+class ThumbnailCache:
+    """Generates fixed-width thumbnails on first request and keeps them on disk.
+
+    The directory is treated as an LRU: once the total size goes over
+    ``max_bytes`` the least recently served files are removed. Recency is
+    tracked in memory and mirrored to the file mtime so it survives restarts.
+    """
+
+    def __init__(self, thumb_dir: str, source_dirs: Iterable[str], widths=THUMB_WIDTHS,
+                 max_bytes: int = THUMB_CACHE_MAX_BYTES, quality: int = THUMB_QUALITY):
+        self.thumb_dir = thumb_dir
+        self.source_dirs = [d for d in source_dirs if d]
+        self.widths = tuple(sorted(widths))
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # path -> size, oldest first
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+        self._load_existing()
+
+    def _load_existing(self):
+        os.makedirs(self.thumb_dir, exist_ok=True)
+        found = []
+        for name in os.listdir(self.thumb_dir):
+            path = os.path.join(self.thumb_dir, name)
+            if name.startswith(".") or not os.path.isfile(path):
+                continue
+            st = os.stat(path)
+            found.append((st.st_mtime, path, st.st_size))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._total += size
+        self._evict()
+
+    def pick_width(self, requested: Optional[int]) -> int:
+        if not requested:
+            requested = DEFAULT_THUMB_WIDTH
+        for w in self.widths:
+            if w >= requested:
+                return w
+        return self.widths[-1]
+
+    def _find_source(self, filename: str) -> Optional[str]:
+        for directory in self.source_dirs:
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def thumb_path(self, filename: str, width: int, fmt: str = "jpeg") -> str:
+        # The full name, extension included: photo.jpg and photo.png are different images
+        ext = "jpg" if fmt == "jpeg" else fmt
+        return os.path.join(self.thumb_dir, f"{filename}.w{width}.{ext}")
+
+    def get(self, filename: str, width: int, fmt: str = "jpeg") -> Optional[str]:
+        """Return the path of the thumbnail in ``fmt``, generating it if needed.
+
+        Blocking (Pillow + disk I/O) - call it from a worker thread.
+        """
+        # Only plain file names - no directory traversal out of the source dirs
+        if not filename or os.path.basename(filename) != filename or filename.startswith("."):
+            return None
+        source = self._find_source(filename)
+        if not source:
+            return None
+
+        target = self.thumb_path(filename, width, fmt)
+        try:
+            fresh = os.path.getmtime(target) >= os.path.getmtime(source)
+        except OSError:
+            fresh = False
+
+        if fresh:
+            self.hits += 1
+            self._touch(target)
+            return target
+
+        self.misses += 1
+        self._render(source, target, width, fmt)
+        self._add(target, os.path.getsize(target))
+        return target
+
+    def _render(self, source: str, target: str, width: int, fmt: str):
+        with Image.open(source) as img:
+            # Let the JPEG decoder skip straight to a reduced scale when it can
+            img.draft("RGB", (width, width * 4))
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "RGBA", "L"):
+                img = img.convert("RGBA")
+            if img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.Resampling.LANCZOS)
+            data = encode_image(img, fmt, quality=self.quality if fmt == "jpeg" else None)
+        # Write to a temp name first so concurrent readers never see a partial file
+        tmp = f"{target}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+
+    def _touch(self, path: str):
+        with self._lock:
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _add(self, path: str, size: int):
+        with self._lock:
+            self._total -= self._entries.pop(path, 0)
+            self._entries[path] = size
+            self._total += size
+            self._evict()
+
+    def _evict(self):
+        # Never evict the entry we just added, even if it alone is over the cap
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
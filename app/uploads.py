@@ -0,0 +1,163 @@
+import asyncio
+import io
+import json
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Union
+
+import cloudinary
+import urllib3
+from cloudinary import utils as cloudinary_utils
+
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+UPLOAD_RETRIES = int(os.getenv("UPLOAD_RETRIES", "3"))
+UPLOAD_BACKOFF = float(os.getenv("UPLOAD_BACKOFF", "0.5"))
+UPLOAD_TIMEOUT = float(os.getenv("UPLOAD_TIMEOUT", "60"))
+UPLOAD_FOLDER = "aakrittii_uploads"
+# Cloudinary's limit for one delete_resources call
+DELETE_BATCH_SIZE = 100
+
+
+class UploadError(Exception):
+    """Upload rejected by Cloudinary (bad file, bad credentials...). Not retried."""
+
+
+class TransientUploadError(UploadError):
+    """Network failure, timeout, 429 or 5xx - worth retrying."""
+
+
+class UploadService:
+    """Shared async client for Cloudinary uploads.
+
+    Uploads run on a small dedicated thread pool so the event loop never waits
+    on the network. All threads share one urllib3 PoolManager whose per-host
+    pool is as large as the concurrency cap, so keep-alive connections are
+    reused instead of being opened and thrown away per upload.
+    """
+
+    def __init__(self, concurrency: int = UPLOAD_CONCURRENCY, retries: int = UPLOAD_RETRIES,
+                 backoff: float = UPLOAD_BACKOFF, timeout: float = UPLOAD_TIMEOUT):
+        self.concurrency = max(concurrency, 1)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=self.concurrency,
+            block=True,
+            **cloudinary.CERT_KWARGS,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="upload")
+        self._slots = None
+        self.in_flight = 0
+        self.uploaded = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def upload(self, file: Union[bytes, io.BytesIO], folder: str = UPLOAD_FOLDER, **options) -> dict:
+        """Upload a file and return Cloudinary's JSON response."""
+        data = file.getvalue() if isinstance(file, io.BytesIO) else file
+        options["folder"] = folder
+        result = await self._call(self._upload_sync, data, options)
+        self.uploaded += 1
+        return result
+
+    async def delete_resources(self, public_ids: List[str]) -> dict:
+        """Delete up to 100 image assets in one Admin API call.
+
+        Returns Cloudinary's ``{"deleted": {public_id: "deleted" | "not_found"}}``.
+        """
+        if len(public_ids) > DELETE_BATCH_SIZE:
+            raise ValueError(f"At most {DELETE_BATCH_SIZE} public ids per call")
+        return await self._call(self._delete_sync, list(public_ids))
+
+    async def _call(self, fn, *args):
+        # Run a blocking request on the upload threads, retrying transient failures
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        attempt = 0
+        while True:
+            try:
+                async with self._slots:
+                    self.in_flight += 1
+                    try:
+                        return await loop.run_in_executor(self._executor, fn, *args)
+                    finally:
+                        self.in_flight -= 1
+            except TransientUploadError as e:
+                if attempt >= self.retries:
+                    self.failed += 1
+                    raise
+                # Exponential backoff with jitter; the slot is released while we sleep
+                delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+                print(f"Cloudinary request failed ({e}), retrying in {delay:.2f}s")
+                attempt += 1
+                self.retried += 1
+                await asyncio.sleep(delay)
+            except UploadError:
+                self.failed += 1
+                raise
+
+    def _upload_sync(self, data: bytes, options: dict) -> dict:
+        # Same request cloudinary.uploader.upload builds, sent through our pooled connector
+        params = cloudinary_utils.build_upload_params(**options)
+        params = cloudinary_utils.sign_request(cloudinary_utils.cleanup_params(params), options)
+        fields = []
+        for k, v in params.items():
+            if isinstance(v, list):
+                fields.extend((f"{k}[]", i) for i in v)
+            elif v:
+                fields.append((k, v))
+        fields.append(("file", ("file", data)))
+        url = cloudinary_utils.cloudinary_api_url("upload", **options)
+
+        return self._request("POST", url, fields, {"User-Agent": cloudinary.get_user_agent()})
+
+    def _delete_sync(self, public_ids: List[str]) -> dict:
+        # Admin API: DELETE /resources/image/upload?public_ids[]=...
+        config = cloudinary.config()
+        prefix = config.upload_prefix or "https://api.cloudinary.com"
+        url = f"{prefix}/{cloudinary.API_VERSION}/{config.cloud_name}/resources/image/upload"
+        headers = urllib3.make_headers(
+            user_agent=cloudinary.get_user_agent(),
+            basic_auth=f"{config.api_key}:{config.api_secret}",
+        )
+        return self._request("DELETE", url, [("public_ids[]", p) for p in public_ids], headers)
+
+    def _request(self, method: str, url: str, fields, headers) -> dict:
+        try:
+            response = self._http.request(
+                method, url, fields=fields, headers=headers,
+                timeout=self.timeout, retries=False,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise TransientUploadError(f"Connection error: {e!r}")
+
+        if response.status == 429 or response.status >= 500:
+            raise TransientUploadError(f"Cloudinary returned HTTP {response.status}")
+        try:
+            result = json.loads(response.data.decode("utf-8"))
+        except ValueError:
+            raise UploadError(f"Unreadable Cloudinary response (HTTP {response.status})")
+        if "error" in result:
+            raise UploadError(result["error"].get("message", "Request failed"))
+        return result
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._http.clear()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "uploaded": self.uploaded,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+upload_service = UploadService()
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+
+# How long the in-process copy of the counters is trusted before re-reading
+# them. Writes made by this process are seen immediately; writes made by other
+# workers/instances within this window can still be answered with a 304.
+TABLE_VERSION_TTL = float(os.getenv("TABLE_VERSION_TTL", "2"))
+
+
+class TableVersions:
+    """Per-table change counters persisted in ``table_versions``.
+
+    Mutating handlers call ``bump()`` before committing, so the counter moves
+    in the same transaction as the rows, and ``invalidate()`` once committed.
+    Readers get all counters with a single primary-key scan, at most once per
+    TABLE_VERSION_TTL.
+
+    The copy is kept per engine: a lagging read replica must hand out the
+    versions matching the rows it returns, not the primary's newer ones.
+    """
+
+    def __init__(self, ttl: float = TABLE_VERSION_TTL):
+        self.ttl = ttl
+        self._versions: Dict[int, Dict[str, int]] = {}
+        self._loaded_at: Dict[int, float] = {}
+
+    async def ensure(self, session: AsyncSession):
+        # Create a counter row for every table that doesn't have one yet
+        result = await session.execute(select(models.TableVersion.name))
+        existing = set(result.scalars().all())
+        for name in models.Base.metadata.tables:
+            if name not in existing and name != models.TableVersion.__tablename__:
+                session.add(models.TableVersion(name=name, version=0))
+
+    async def current(self, session: AsyncSession, *tables: str) -> tuple:
+        source = id(session.bind)
+        if time.monotonic() - self._loaded_at.get(source, 0.0) > self.ttl:
+            result = await session.execute(select(models.TableVersion.name, models.TableVersion.version))
+            self._versions[source] = dict(result.all())
+            self._loaded_at[source] = time.monotonic()
+        versions = self._versions[source]
+        return tuple(versions.get(t, 0) for t in tables)
+
+    async def bump(self, session: AsyncSession, *tables: str):
+        await session.execute(
+            update(models.TableVersion)
+            .where(models.TableVersion.name.in_(tables))
+            .values(version=models.TableVersion.version + 1)
+        )
+
+    def invalidate(self):
+        """Re-read the counters on the next request. Call after committing a bump.
+
+        Not before: a read between the bump and the commit would load the old
+        counters and keep them for the whole TTL, while the new rows are cached
+        under the old ETag.
+        """
+        self._loaded_at.clear()
+
+
+def make_etag(request: Request, versions: tuple) -> str:
+    # Strong validator: same path + query + table versions => byte-identical body
+    raw = f"{request.url.path}?{request.url.query}|{versions}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [c.strip() for c in header.split(",")]
+    # If-None-Match uses weak comparison
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+table_versions = TableVersions()
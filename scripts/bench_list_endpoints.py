@@ -0,0 +1,92 @@
+"""Compare list serialization paths on a throwaway SQLite database.
+
+    python scripts/bench_list_endpoints.py --rows 2000 --repeat 20
+
+"orm+pydantic" is what the list endpoints used to do: load ORM objects,
+validate them through the response model and encode with the stdlib JSON
+encoder. "columns+fast" is the current path: select the schema's columns as
+row mappings and encode them with app.serialization (orjson when installed).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app import models, schemas  # noqa: E402
+from app.serialization import orjson, rows_to_json, schema_columns  # noqa: E402
+
+ENDPOINTS = {
+    "/api/images": (models.GalleryImage, schemas.GalleryImage),
+    "/api/volunteers": (models.Volunteer, schemas.Volunteer),
+    "/api/press-releases": (models.PressRelease, schemas.PressRelease),
+    "/api/activities": (models.Activity, schemas.Activity),
+}
+
+
+def fake_rows(model, count: int) -> list:
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4
+    values = {
+        models.GalleryImage: lambda i: {"folder_id": 1, "image_url": f"https://res.cloudinary.com/demo/image/upload/v1/img_{i}.jpg", "description": text},
+        models.Volunteer: lambda i: {"name": f"Volunteer {i}", "email": f"v{i}@example.com", "phone": "9999999999", "message": text},
+        models.PressRelease: lambda i: {"title": f"Press release {i}", "date": "2024-01-01", "content": text * 5, "image_url": ""},
+        models.Activity: lambda i: {"title": f"Activity {i}", "date": "2024-01-01", "location": "Chennai", "description": text, "image_url": ""},
+    }[model]
+    return [values(i) for i in range(count)]
+
+
+async def bench(rows: int, repeat: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+        await conn.execute(insert(models.GalleryFolder).values(name="Bench"))
+        for model, _ in ENDPOINTS.values():
+            await conn.execute(insert(model), fake_rows(model, rows))
+
+    print(f"{rows} rows per response, best of {repeat}, encoder: {'orjson' if orjson else 'json (stdlib)'}")
+    print(f"{'endpoint':<22}{'orm+pydantic':>16}{'columns+fast':>16}{'speedup':>10}")
+    async with engine.connect() as conn:
+        for endpoint, (model, schema) in ENDPOINTS.items():
+            adapter = TypeAdapter(List[schema])
+            columns = schema_columns(model, schema)
+
+            async def orm_path():
+                async with AsyncSession(conn) as session:
+                    items = (await session.execute(select(model))).scalars().all()
+                    validated = adapter.validate_python(items, from_attributes=True)
+                    return json.dumps(jsonable_encoder(validated)).encode()
+
+            async def fast_path():
+                result = await conn.execute(select(*columns))
+                return rows_to_json(result.mappings().all())
+
+            timings = []
+            for fn in (orm_path, fast_path):
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    await fn()
+                    best = min(best, time.perf_counter() - start)
+                timings.append(best)
+            slow, fast = (1 / t for t in timings)
+            print(f"{endpoint:<22}{slow:>12.1f} r/s{fast:>12.1f} r/s{timings[0] / timings[1]:>9.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.repeat))
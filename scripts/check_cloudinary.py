@@ -0,0 +1,133 @@
+"""Check upload retries and the reaper's batched deletes against a fake Cloudinary.
+
+    python scripts/check_cloudinary.py --assets 250
+
+Runs scripts/fake_cloudinary.py on a free port and the reaper on a throwaway
+SQLite database, so nothing reaches the real Cloudinary account or the app's
+database. Checks that an upload answered with 5xx is retried until it
+succeeds, that a 4xx is not retried, that an upload still failing after
+UPLOAD_RETRIES retries raises, and that the reaper deletes every queued asset
+exactly once with at most 100 public ids per DELETE. Exits 1 if any check fails.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+# Retries shouldn't make the check slow
+os.environ.setdefault("UPLOAD_BACKOFF", "0.01")
+
+import cloudinary  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app import models  # noqa: E402
+from app.reaper import AssetReaper  # noqa: E402
+from app.uploads import DELETE_BATCH_SIZE, TransientUploadError, UploadError, upload_service  # noqa: E402
+from fake_cloudinary import FakeCloudinary  # noqa: E402
+
+
+async def try_upload():
+    try:
+        return await upload_service.upload(b"image"), None
+    except UploadError as e:
+        return None, e
+
+
+def report(name: str, ok: bool, detail: str) -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {name}: {detail}")
+    return ok
+
+
+async def check_upload_retries(fake: FakeCloudinary) -> bool:
+    ok = True
+    retries = upload_service.retries
+
+    fake.reset()
+    fake.fail_next(retries, status=503)
+    result, raised = await try_upload()
+    statuses = [r.status for r in fake.requests_for("POST")]
+    ok &= report("upload after 5xx", statuses == [503] * retries + [200] and bool(result and result.get("secure_url")),
+                 f"statuses {statuses}, raised {type(raised).__name__}")
+
+    fake.reset()
+    fake.fail_next(1, status=400)
+    _, raised = await try_upload()
+    statuses = [r.status for r in fake.requests_for("POST")]
+    ok &= report("upload after 4xx", statuses == [400] and not isinstance(raised, TransientUploadError),
+                 f"statuses {statuses}, raised {type(raised).__name__}")
+
+    fake.reset()
+    fake.fail_next(retries + 1, status=502)
+    _, raised = await try_upload()
+    statuses = [r.status for r in fake.requests_for("POST")]
+    ok &= report("upload that keeps failing", statuses == [502] * (retries + 1) and isinstance(raised, TransientUploadError),
+                 f"statuses {statuses}, raised {type(raised).__name__}")
+    return ok
+
+
+async def check_reaper_batches(fake: FakeCloudinary, assets: int) -> bool:
+    path = os.path.join(tempfile.mkdtemp(), "check.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    queued_at = datetime.utcnow() - timedelta(hours=1)
+    public_ids = [f"aakrittii_uploads/asset{i}" for i in range(assets)]
+    async with Session() as session:
+        session.add_all(
+            models.CloudinaryAsset(
+                public_id=public_id,
+                url=f"https://res.cloudinary.com/demo/image/upload/v1/{public_id}.jpg",
+                queued_at=queued_at,
+            )
+            for public_id in public_ids
+        )
+        await session.commit()
+
+    fake.reset()
+    # One transient failure on the first batch: retried, not dropped
+    fake.fail_next(1, status=503)
+    reaper = AssetReaper(Session, interval=0, grace=0, max_per_run=assets)
+    result = await reaper.run_once()
+
+    deletes = [r for r in fake.requests_for("DELETE") if r.status == 200]
+    batches = [r.params.get("public_ids[]", []) for r in deletes]
+    sent = [public_id for batch in batches for public_id in batch]
+    async with Session() as session:
+        left = (await session.execute(select(func.count()).select_from(models.CloudinaryAsset))).scalar()
+    await engine.dispose()
+
+    expected_calls = -(-assets // DELETE_BATCH_SIZE)
+    ok = report("reaper batch sizes", len(batches) == expected_calls and all(len(b) <= DELETE_BATCH_SIZE for b in batches),
+                f"{len(batches)} DELETE calls of {[len(b) for b in batches]} ids, expected {expected_calls}")
+    ok &= report("reaper deletes each asset once", sorted(sent) == sorted(public_ids),
+                 f"{len(sent)} ids sent, {len(set(sent))} distinct, {assets} queued")
+    ok &= report("reaper forgets deleted assets", result["purged"] == assets and left == 0,
+                 f"purged {result['purged']}, {left} rows left")
+    return ok
+
+
+async def check(assets: int) -> bool:
+    fake = FakeCloudinary().start()
+    cloudinary.config(cloud_name=fake.cloud_name, api_key="key", api_secret="secret", upload_prefix=fake.url)
+    print(f"Fake Cloudinary on {fake.url}, UPLOAD_RETRIES={upload_service.retries}")
+    try:
+        ok = await check_upload_retries(fake)
+        ok &= await check_reaper_batches(fake, assets)
+    finally:
+        upload_service.close()
+        fake.stop()
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=250)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(check(args.assets)) else 1)
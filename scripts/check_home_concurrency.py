@@ -0,0 +1,54 @@
+"""Fire concurrent cold GET /api/home requests and check they all succeed.
+
+    python scripts/check_home_concurrency.py --requests 8 --rounds 5
+
+Each round starts cold (cached responses and table versions dropped), as
+after every admin edit and on startup, then sends the requests at once. A
+cold request must not hold more than one read connection, or a burst of
+them exhausts the pool and fails after DB_POOL_TIMEOUT. Runs against the
+app's configured database; exits 1 if any request didn't return 200.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# Fail fast instead of after the default 30s when the pool runs dry
+os.environ.setdefault("DB_POOL_TIMEOUT", "3")
+
+import httpx  # noqa: E402
+
+from app.database import read_engine  # noqa: E402
+from app.main import app, response_cache  # noqa: E402
+from app.versions import table_versions  # noqa: E402
+
+
+async def check(requests: int, rounds: int) -> bool:
+    await app.router.startup()
+    ok = True
+    try:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            print(f"{requests} concurrent cold requests per round, read pool size {read_engine.pool.size()}")
+            for n in range(rounds):
+                response_cache.invalidate("pillars", "activities", "clientele", "csr_connects", "press_releases")
+                table_versions._loaded_at.clear()
+                started = time.perf_counter()
+                responses = await asyncio.gather(*(client.get("/api/home") for _ in range(requests)))
+                elapsed = (time.perf_counter() - started) * 1000
+                statuses = sorted(r.status_code for r in responses)
+                print(f"round {n + 1}: {elapsed:8.1f} ms  statuses {statuses}")
+                ok = ok and all(status == 200 for status in statuses)
+    finally:
+        await app.router.shutdown()
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=read_engine.pool.size() + 4)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(check(args.requests, args.rounds)) else 1)
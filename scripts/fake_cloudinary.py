@@ -0,0 +1,116 @@
+"""A stand-in for Cloudinary's upload and Admin APIs, for local checks.
+
+    python scripts/fake_cloudinary.py --port 9000
+
+Point the app at it with CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:9000 and
+any cloud name, API key and secret. Uploads get a made-up public_id and
+secure_url; DELETE .../resources/image/upload reports every public id it was
+given as deleted. Each request is recorded, and the next few requests can be
+made to fail, so a check can see what the app sent and how it handled errors.
+"""
+import argparse
+import itertools
+import json
+import threading
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FakeRequest = namedtuple("FakeRequest", "method path params status")
+
+
+class FakeCloudinary:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, cloud_name: str = "demo"):
+        self.cloud_name = cloud_name
+        self.requests = []
+        self._failures = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count: int, status: int = 503):
+        """Answer the next ``count`` requests with ``status`` instead of handling them."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def requests_for(self, method: str) -> list:
+        return [r for r in self.requests if r.method == method]
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self._failures.clear()
+
+    def start(self) -> "FakeCloudinary":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, method: str, path: str, params: dict):
+        with self._lock:
+            status = self._failures.pop(0) if self._failures else None
+        if status is not None:
+            body = {"error": {"message": f"Fake failure (HTTP {status})"}}
+        elif method == "POST" and path.endswith("/image/upload"):
+            status = 200
+            public_id = f"aakrittii_uploads/fake{next(self._ids)}"
+            body = {
+                "public_id": public_id,
+                "secure_url": f"https://res.cloudinary.com/{self.cloud_name}/image/upload/v1/{public_id}.jpg",
+            }
+        elif method == "DELETE" and path.endswith("/resources/image/upload"):
+            status = 200
+            body = {"deleted": {public_id: "deleted" for public_id in params.get("public_ids[]", [])}}
+        else:
+            status = 404
+            body = {"error": {"message": f"No fake for {method} {path}"}}
+        with self._lock:
+            self.requests.append(FakeRequest(method, path, params, status))
+        return status, body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        # Upload bodies are multipart and not inspected; Admin API calls carry
+        # their parameters in the query string
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, body = self.server.fake.handle(self.command, url.path, parse_qs(url.query))
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_POST = _handle
+    do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+    fake = FakeCloudinary(args.host, args.port)
+    print(f"Fake Cloudinary on {fake.url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
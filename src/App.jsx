@@ -13,6 +13,7 @@ import BookTabs from './components/BookTabs';
 
 import { onAuthStateChanged } from 'firebase/auth';
 import { auth } from './firebase';
+import { refreshHome } from './utils/api';
 
 // Lazy Load Non-Critical Components for Performance
 const Essence = React.lazy(() => import('./components/Essence'));
@@ -51,6 +52,7 @@ function App() {
 
   const handleAdminClose = () => {
     setIsAdminOpen(false);
+    refreshHome();
     setContentVersion(prev => prev + 1);
   };
 
@@ -1,12 +1,13 @@
 import React, { useState, useEffect } from 'react';
-import { apiFetch } from '../utils/api';
+import { fetchHome, getOptimizedUrl } from '../utils/api';
 
 const Activities = () => {
     const [activities, setActivities] = useState([]);
 
     useEffect(() => {
-        apiFetch('/api/activities')
-            .then(data => setActivities(data)) // Showing all activities
+        fetchHome()
+            .then(home => home.activities)
+            .then(data => setActivities(data))
             .catch(err => console.error("Error fetching activities:", err));
     }, []);
 
@@ -40,7 +41,7 @@ const Activities = () => {
                                 {activity.image_url ? (
                                     <div style={{
                                         width: '100%', height: '100%',
-                                        backgroundImage: `url(${activity.image_url})`,
+                                        backgroundImage: `url(${getOptimizedUrl(activity.image_url, 1200)})`,
                                         backgroundSize: 'cover',
                                         backgroundPosition: 'center',
                                         filter: 'grayscale(20%)'
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
 import { Plus, Trash2, Edit2, Save, X, Upload } from 'lucide-react';
-import { apiFetch } from '../utils/api';
+import { apiFetch, apiFetchAll } from '../utils/api';
 import './AdminDashboard.css';
 
 const AdminDashboard = ({ user, onClose }) => {
@@ -30,7 +30,7 @@ const AdminDashboard = ({ user, onClose }) => {
                 case 'press-releases': endpoint = '/api/press-releases'; break;
                 default: return;
             }
-            const result = await apiFetch(endpoint);
+            const result = await apiFetchAll(endpoint);
             setData(result);
         } catch (err) {
             console.error("Error fetching data:", err);
@@ -38,9 +38,28 @@ const AdminDashboard = ({ user, onClose }) => {
         }
     };
 
-    const handleEdit = (item) => {
-        setEditingId(item.id);
-        const newFormData = { ...item };
+    const handleEdit = async (item) => {
+        // List rows only carry summary fields; edit the full record
+        let full = item;
+        let endpoint = '';
+        switch (activeTab) {
+            case 'pillars': endpoint = `/api/pillars/${item.id}`; break;
+            case 'activities': endpoint = `/api/activities/${item.id}`; break;
+            case 'clientele': endpoint = `/api/clientele/${item.id}`; break;
+            case 'csr': endpoint = `/api/csr-connects/${item.id}`; break;
+            case 'press-releases': endpoint = `/api/press-releases/${item.id}`; break;
+        }
+        if (endpoint) {
+            try {
+                full = await apiFetch(endpoint);
+            } catch (err) {
+                console.error("Error loading item:", err);
+                setError("Failed to load item: " + err.message);
+                return;
+            }
+        }
+        setEditingId(full.id);
+        const newFormData = { ...full };
         // Clear file input value as we can't set it programmatically
         if (newFormData.image_url) delete newFormData.image_url;
         if (newFormData.logo_url) delete newFormData.logo_url;
@@ -304,7 +323,7 @@ const AdminDashboard = ({ user, onClose }) => {
                                             />
                                             <div>
                                                 <h4>{item.title || item.name || item.company_name}</h4>
-                                                <p>{(item.description || '').substring(0, 50)}...</p>
+                                                {item.description && <p>{item.description.substring(0, 50)}...</p>}
                                             </div>
                                         </div>
                                         <div className="item-actions">
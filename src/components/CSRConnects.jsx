@@ -1,11 +1,12 @@
 import React, { useState, useEffect } from 'react';
-import { apiFetch } from '../utils/api';
+import { fetchHome } from '../utils/api';
 
 const CSRConnects = () => {
     const [connects, setConnects] = useState([]);
 
     useEffect(() => {
-        apiFetch('/api/csr-connects')
+        fetchHome()
+            .then(home => home.csr_connects)
             .then(data => setConnects(data))
             .catch(err => console.error("Error fetching CSR connects:", err));
     }, []);
@@ -1,11 +1,12 @@
 import React, { useState, useEffect } from 'react';
-import { apiFetch } from '../utils/api';
+import { fetchHome } from '../utils/api';
 
 const Clientele = () => {
     const [clients, setClients] = useState([]);
 
     useEffect(() => {
-        apiFetch('/api/clientele')
+        fetchHome()
+            .then(home => home.clientele)
             .then(data => setClients(data))
             .catch(err => console.error("Error fetching clientele:", err));
     }, []);
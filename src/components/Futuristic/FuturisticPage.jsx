@@ -6,6 +6,7 @@ import Login from '../Login';
 import AdminDashboard from '../AdminDashboard';
 import { onAuthStateChanged } from 'firebase/auth';
 import { auth } from '../../firebase';
+import { refreshHome } from '../../utils/api';
 import './styles.css';
 
 const FuturisticPage = () => {
@@ -35,6 +36,7 @@ const FuturisticPage = () => {
 
     const handleAdminClose = () => {
         setIsAdminOpen(false);
+        refreshHome();
         setContentVersion(prev => prev + 1);
     };
 
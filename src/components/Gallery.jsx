@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { X, ZoomIn, Folder, Plus, Trash2, ArrowLeft, Upload } from 'lucide-react';
-import { apiFetch, getImageUrl } from '../utils/api';
+import { apiFetch, apiFetchAll, getImageUrl, getOptimizedUrl } from '../utils/api';
 import './Gallery.css';
 
 // MOCK DATA FOR DEMONSTRATION (Used when Firebase is not configured)
@@ -18,21 +18,6 @@ const INITIAL_IMAGES = [
     { id: 'img5', folderId: '1', url: "https://images.unsplash.com/photo-1532629345422-7515f3d16bb6?q=80&w=1000", description: 'Community feast' },
 ];
 
-/**
- * Optimizes Cloudinary URLs for thumbnail/preview display
- * @param {string} url - Original Image URL
- * @param {number} width - Target width
- * @returns {string} Optimized URL
- */
-const getOptimizedUrl = (url, width = 400) => {
-    if (!url) return '';
-    if (url.includes('cloudinary.com') && url.includes('/upload/')) {
-        // Insert transformation params for massive size reduction
-        return url.replace('/upload/', `/upload/w_${width},c_limit,q_auto,f_auto/`);
-    }
-    return url;
-};
-
 const Gallery = ({ user }) => {
     const [folders, setFolders] = useState([]);
     const [images, setImages] = useState([]);
@@ -48,7 +33,7 @@ const Gallery = ({ user }) => {
     // Fetch Folders on Mount
     useEffect(() => {
         setIsLoading(true);
-        apiFetch('/api/folders')
+        apiFetchAll('/api/folders')
             .then(data => setFolders(data))
             .catch(err => console.error("API Error:", err))
             .finally(() => setIsLoading(false));
@@ -58,7 +43,7 @@ const Gallery = ({ user }) => {
     useEffect(() => {
         if (currentFolder) {
             setIsLoading(true);
-            apiFetch(`/api/images?folderId=${currentFolder.id}`)
+            apiFetchAll(`/api/images?folderId=${currentFolder.id}`)
                 .then(data => setImages(data))
                 .catch(err => console.error("API Error:", err))
                 .finally(() => setIsLoading(false));
@@ -103,21 +88,41 @@ const Gallery = ({ user }) => {
 
         setIsLoading(true);
         try {
-            // Upload all files in parallel
-            const uploadPromises = uploadFiles.map(async (file) => {
+            // Send the files in batches; the server processes and uploads each
+            // batch concurrently and inserts it in one transaction. Batches stay
+            // well under typical request size limits (e.g. 32 MB on Cloud Run).
+            const batches = [];
+            let batch = [];
+            let batchBytes = 0;
+            for (const file of uploadFiles) {
+                if (batch.length && (batch.length >= 20 || batchBytes + file.size > 24 * 1024 * 1024)) {
+                    batches.push(batch);
+                    batch = [];
+                    batchBytes = 0;
+                }
+                batch.push(file);
+                batchBytes += file.size;
+            }
+            if (batch.length) batches.push(batch);
+
+            const newImages = [];
+            const failed = [];
+            for (const files of batches) {
                 const formData = new FormData();
-                formData.append('image', file);
-                formData.append('folderId', currentFolder.id);
-                formData.append('description', uploadDesc || file.name);
+                files.forEach((file) => formData.append('images', file));
+                if (uploadDesc) formData.append('description', uploadDesc);
 
-                return await apiFetch('/api/images', {
+                const result = await apiFetch(`/api/folders/${currentFolder.id}/images:batch`, {
                     method: 'POST',
                     body: formData
                 });
-            });
+                result.results.forEach((r) => (r.ok ? newImages.push(r.image) : failed.push(`${r.filename}: ${r.error}`)));
+            }
 
-            const newImages = await Promise.all(uploadPromises);
             setImages((prev) => [...newImages, ...prev]);
+            if (failed.length) {
+                alert(`${failed.length} file(s) failed to upload:\n${failed.join('\n')}`);
+            }
             setIsUploadOpen(false); // Close modal
         } catch (err) {
             console.error(err);
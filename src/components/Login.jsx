@@ -1,7 +1,7 @@
 import React, { useState } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { X, Lock, Loader, Eye, EyeOff } from 'lucide-react';
-import { apiFetch } from '../utils/api';
+import { apiFetch, setAuthToken } from '../utils/api';
 import './Login.css';
 
 const Login = ({ isOpen, onClose, onLoginSuccess }) => {
@@ -23,6 +23,7 @@ const Login = ({ isOpen, onClose, onLoginSuccess }) => {
                 body: JSON.stringify({ email, password })
             });
 
+            setAuthToken(data.access_token);
             onLoginSuccess(data.user);
             onClose();
         } catch (err) {
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
 import { BookOpen, Utensils, Users, Globe, Heart, HandHeart, Sun } from 'lucide-react';
-import { apiFetch } from '../utils/api';
+import { fetchHome, getOptimizedUrl } from '../utils/api';
 import './Pillars.css';
 import { useMotionValue, useTransform } from 'framer-motion';
 
@@ -31,7 +31,7 @@ const TiltCard = ({ pillar, index, getIcon }) => {
             whileHover={{ scale: 1.05, boxShadow: "0px 20px 40px rgba(201, 168, 117, 0.3)" }}
         >
             <div className="pillar-image-wrapper">
-                <img src={pillar.image_url || pillar.image} alt={pillar.title} className="pillar-image" />
+                <img src={getOptimizedUrl(pillar.image_url || pillar.image, 800)} alt={pillar.title} className="pillar-image" />
                 <div className="pillar-icon-overlay">
                     {getIcon(pillar.icon)}
                 </div>
@@ -79,7 +79,8 @@ const Pillars = () => {
     const [pillars, setPillars] = useState([]);
 
     useEffect(() => {
-        apiFetch('/api/pillars')
+        fetchHome()
+            .then(home => home.pillars)
             .then(data => setPillars(data))
             .catch(err => console.error("Error fetching pillars:", err));
     }, []);
@@ -1,11 +1,12 @@
 import React, { useState, useEffect } from 'react';
-import { apiFetch } from '../utils/api';
+import { fetchHome } from '../utils/api';
 
 const PressReleases = () => {
     const [releases, setReleases] = useState([]);
 
     useEffect(() => {
-        apiFetch('/api/press-releases')
+        fetchHome()
+            .then(home => home.press_releases)
             .then(data => setReleases(data))
             .catch(err => console.error("Error fetching press releases:", err));
     }, []);
@@ -12,6 +12,42 @@ export const getImageUrl = (path) => {
     return `${API_BASE_URL}/${path}`;
 };
 
+/**
+ * Optimizes Cloudinary URLs for display: resized, with format (WebP/AVIF/JPEG)
+ * and quality negotiated by Cloudinary from the browser's Accept header
+ * @param {string} url - Original Image URL
+ * @param {number} width - Target width
+ * @returns {string} Optimized URL
+ */
+export const getOptimizedUrl = (url, width = 400) => {
+    if (!url) return '';
+    if (url.includes('cloudinary.com') && url.includes('/upload/')) {
+        // Insert transformation params for massive size reduction
+        return url.replace('/upload/', `/upload/w_${width},c_limit,q_auto,f_auto/`);
+    }
+    return url;
+};
+
+const TOKEN_KEY = 'aakriti_access_token';
+
+/**
+ * Stores (or with null, clears) the admin access token returned by /api/auth/login.
+ * It is kept for the browser tab's session and sent with every API request.
+ * @param {string|null} token
+ */
+export const setAuthToken = (token) => {
+    if (token) sessionStorage.setItem(TOKEN_KEY, token);
+    else sessionStorage.removeItem(TOKEN_KEY);
+};
+
+export const getAuthToken = () => sessionStorage.getItem(TOKEN_KEY);
+
+const withAuth = (options) => {
+    const token = getAuthToken();
+    if (!token) return options;
+    return { ...options, headers: { ...options.headers, Authorization: `Bearer ${token}` } };
+};
+
 /**
  * Standardized fetch wrapper
  * @param {string} endpoint - API endpoint (e.g., '/api/folders')
@@ -20,7 +56,11 @@ export const getImageUrl = (path) => {
  */
 export const apiFetch = async (endpoint, options = {}) => {
     const url = `${API_BASE_URL}${endpoint}`;
-    const response = await fetch(url, options);
+    const response = await fetch(url, withAuth(options));
+    if (response.status === 401) {
+        // Expired or revoked: the admin has to log in again
+        setAuthToken(null);
+    }
 
     // Handle 204 No Content
     if (response.status === 204) {
@@ -42,3 +82,79 @@ export const apiFetch = async (endpoint, options = {}) => {
         return response.text(); // text/plain or other
     }
 };
+
+/**
+ * Fetches every page of a paginated list endpoint.
+ * List endpoints return one page as a JSON array and put the cursor for the
+ * next page in the X-Next-Cursor header.
+ * @param {string} endpoint - API endpoint (e.g., '/api/volunteers')
+ * @param {object} options - Fetch options
+ * @param {string|null} startCursor - Cursor to start from instead of the first page
+ * @returns {Promise<Array>}
+ */
+export const apiFetchAll = async (endpoint, options = {}, startCursor = null) => {
+    const items = [];
+    let cursor = startCursor;
+    do {
+        const separator = endpoint.includes('?') ? '&' : '?';
+        const url = `${API_BASE_URL}${endpoint}${cursor ? `${separator}cursor=${encodeURIComponent(cursor)}` : ''}`;
+        const response = await fetch(url, withAuth(options));
+        if (response.status === 401) setAuthToken(null);
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.detail || data.message || 'API request failed');
+        }
+        items.push(...data);
+        cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+};
+
+let homePromise = null;
+
+// List endpoint of each /api/home section, for the items past the section limit
+const HOME_SECTION_ENDPOINTS = {
+    pillars: '/api/pillars',
+    activities: '/api/activities',
+    clientele: '/api/clientele',
+    csr_connects: '/api/csr-connects',
+    press_releases: '/api/press-releases',
+};
+
+// /api/home cuts each section off after a fixed number of items and gives the
+// cursor to continue from in home.next; fetch the rest so nothing goes missing
+const completeHomeSections = async (home) => {
+    const rest = await Promise.all(
+        Object.entries(home.next || {})
+            .filter(([section]) => HOME_SECTION_ENDPOINTS[section])
+            .map(async ([section, cursor]) => [
+                section,
+                await apiFetchAll(`${HOME_SECTION_ENDPOINTS[section]}?fields=*`, {}, cursor),
+            ])
+    );
+    for (const [section, items] of rest) {
+        home[section] = [...home[section], ...items];
+    }
+    return home;
+};
+
+/**
+ * Fetches the landing page content (pillars, activities, clientele,
+ * csr_connects, press_releases): one request, plus the remaining pages of any
+ * section longer than the home limit. Sections mounted at the same time share
+ * the request; call refreshHome() after the content changes.
+ * @returns {Promise<object>}
+ */
+export const fetchHome = () => {
+    if (!homePromise) {
+        homePromise = apiFetch('/api/home').then(completeHomeSections).catch((err) => {
+            homePromise = null;
+            throw err;
+        });
+    }
+    return homePromise;
+};
+
+export const refreshHome = () => {
+    homePromise = null;
+};